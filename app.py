@@ -2,6 +2,9 @@ from flask import Flask, request, g  # type: ignore
 from database import db   # import db from database.py
 from models import User, Category, Transaction, Budget, Goal, RecurringTransaction  # import your models
 import models_standard  # import advanced logic and analytics
+from app.config import config
+from app.utils import mask_sensitive_data
+from app import request_logging, metrics, category_cache, sqlite_profile, compact_schema, compression, recurring_scheduler, query_stats, slow_query_log, request_profiler
 # JWT imports temporarily removed for testing
 # from flask_jwt_extended import JWTManager
 from flasgger import Swagger
@@ -13,6 +16,7 @@ from datetime import datetime
 
 
 app = Flask(__name__)
+app.config.from_object(config['default'])
 
 # JWT configuration temporarily disabled
 # app.config['JWT_SECRET_KEY'] = '9512'  # change to env variable later
@@ -67,6 +71,10 @@ def log_request_info():
     """Log detailed information about incoming requests"""
     g.start_time = time.time()
     
+    # Structured mode replaces this verbose output (see app/request_logging.py)
+    if app.config['REQUEST_LOG_MODE'] != 'verbose':
+        return
+    
     # Get request data
     method = request.method
     url = request.url
@@ -93,23 +101,12 @@ def log_request_info():
         except Exception as e:
             api_logger.warning(f"   Body: Could not parse JSON - {str(e)}")
 
-def mask_sensitive_data(data):
-    """Mask sensitive fields in request/response data"""
-    if not isinstance(data, dict):
-        return data
-    
-    sensitive_fields = ['password', 'password_hash', 'current_password', 'new_password', 'access_token', 'refresh_token']
-    masked_data = data.copy()
-    
-    for field in sensitive_fields:
-        if field in masked_data:
-            masked_data[field] = "***MASKED***"
-    
-    return masked_data
-
 @app.after_request
 def log_response_info(response):
     """Log detailed information about outgoing responses"""
+    if app.config['REQUEST_LOG_MODE'] != 'verbose':
+        return response
+    
     try:
         # Calculate request duration
         duration = round((time.time() - g.start_time) * 1000, 2)  # in milliseconds
@@ -145,6 +142,11 @@ def log_response_info(response):
         log_method(f"   Content-Type: {content_type}")
         log_method(f"   Content-Length: {content_length}")
         
+        # SQL statements run by the request (see app/query_stats.py)
+        db_stats = g.get('query_stats')
+        if db_stats is not None:
+            log_method(f"   DB: {db_stats.count} queries, {db_stats.time_ms}ms")
+        
         # Log response body for JSON responses (truncated)
         if response.is_json and hasattr(response, 'get_json'):
             try:
@@ -167,6 +169,18 @@ def log_response_info(response):
     
     return response
 
+# Compact, queue-backed access log (only active when REQUEST_LOG_MODE is "structured")
+request_logging.init_app(app)
+
+# Per-endpoint latency/size histograms, exported at /metrics
+metrics.init_app(app)
+
+# cProfile for requests that send X-Profile-Token or hit PROFILER_ENDPOINTS
+request_profiler.init_app(app)
+
+# gzip/brotli response compression (wraps the WSGI app, after all request hooks)
+compression.init_app(app)
+
 # Swagger configuration
 swagger = Swagger(app)
 
@@ -176,6 +190,12 @@ app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 # ✅ bind db 
 db.init_app(app)
+sqlite_profile.init_app(app)
+query_stats.init_app(app)
+slow_query_log.init_app(app)
+compact_schema.init_app(app)
+category_cache.init_app(app)
+recurring_scheduler.init_app(app)
 # JWT manager temporarily disabled
 # jwt = JWTManager(app)
 
@@ -188,7 +208,10 @@ from app.routes.transaction_routes import transaction_bp
 from app.routes.budget_routes import budget_bp
 from app.routes.goal_routes import goal_bp
 from app.routes.recurring_routes import recurring_bp
+from app.routes.forecast_routes import forecast_bp
 from app.routes.health_route import health_bp
+from app.routes.metrics_route import metrics_bp
+from app.routes.profiles_route import profiles_bp
 # Register all blueprints
 app.register_blueprint(auth_bp)
 app.register_blueprint(user_bp)
@@ -197,7 +220,10 @@ app.register_blueprint(transaction_bp)
 app.register_blueprint(budget_bp)
 app.register_blueprint(goal_bp)
 app.register_blueprint(recurring_bp)
+app.register_blueprint(forecast_bp)
 app.register_blueprint(health_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(profiles_bp)
 
 # Test route (keep it)
 @app.route('/')
@@ -208,4 +234,6 @@ if __name__ == '__main__':
     # Make sure tables exist before running
     with app.app_context():
         db.create_all()
+        models_standard.CategoryManager.ensure_closure()
+        models_standard.MonthlyRollup.ensure_rollup()
     app.run(debug=True)
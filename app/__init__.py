@@ -2,22 +2,40 @@ from flask import Flask
 from database import db
 from flask_jwt_extended import JWTManager
 from flasgger import Swagger
+from app.config import config
 
-def create_app():
-    """Flask application factory"""
+def create_app(test_config=None):
+    """Flask application factory (test_config overrides settings, e.g. the database URI)"""
     app = Flask(__name__)
     
     # Configuration
+    app.config.from_object(config['default'])
     app.config['JWT_SECRET_KEY'] = '9512'  # TODO: Move to environment variable
     app.config['JWT_IDENTITY_CLAIM'] = 'sub'
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///budget.db"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if test_config:
+        app.config.update(test_config)
     
     # Initialize extensions
     db.init_app(app)
+    from app import category_cache, sqlite_profile, compact_schema, recurring_scheduler, query_stats, slow_query_log
+    sqlite_profile.init_app(app)
+    query_stats.init_app(app)
+    slow_query_log.init_app(app)
+    compact_schema.init_app(app)
+    category_cache.init_app(app)
+    recurring_scheduler.init_app(app)
     jwt = JWTManager(app)
     swagger = Swagger(app)
     
+    # Request logging
+    from app import request_logging, metrics, request_profiler, compression
+    request_logging.init_app(app)
+    metrics.init_app(app)
+    request_profiler.init_app(app)
+    compression.init_app(app)
+    
     # Import models to ensure they're registered
     from models import User, Category, Transaction, Budget, Goal, RecurringTransaction
     
@@ -29,6 +47,10 @@ def create_app():
     from app.routes.budget_routes import budget_bp
     from app.routes.goal_routes import goal_bp
     from app.routes.recurring_routes import recurring_bp
+    from app.routes.forecast_routes import forecast_bp
+    from app.routes.health_route import health_bp
+    from app.routes.metrics_route import metrics_bp
+    from app.routes.profiles_route import profiles_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
@@ -37,6 +59,10 @@ def create_app():
     app.register_blueprint(budget_bp)
     app.register_blueprint(goal_bp)
     app.register_blueprint(recurring_bp)
+    app.register_blueprint(forecast_bp)
+    app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiles_bp)
     
     # Test route
     @app.route('/')
@@ -0,0 +1,133 @@
+import threading
+import time
+from flask import current_app
+from database import db
+
+class CategorySnapshot:
+    """Immutable view of the category table with pre-serialized responses"""
+
+    def __init__(self, ids, tree_body, flat_body, loaded_at, version=None):
+        self.ids = ids
+        self.tree_body = tree_body
+        self.flat_body = flat_body
+        self.loaded_at = loaded_at
+        self.version = version
+
+class CategoryCache:
+    """In-process cache of the category tree, flat list and id set
+
+    Writes made through this process call invalidate(). The TTL bounds how
+    stale another worker process can be after one of its own writes; callers
+    that know the current change version (see app.change_versions) pass it
+    to get() and never see an older snapshot.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def _is_fresh(self, snapshot, version):
+        if snapshot is None or (version is not None and snapshot.version != version):
+            return False
+        return not self.ttl or time.monotonic() - snapshot.loaded_at < self.ttl
+
+    def get(self, version=None):
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            # Another thread may have rebuilt it while we were waiting
+            snapshot = self._snapshot
+            if not self._is_fresh(snapshot, version):
+                snapshot = self._load(version)
+                self._snapshot = snapshot
+            return snapshot
+
+    def _load(self, version=None):
+        from models import Category
+
+        rows = db.session.query(Category.id, Category.name, Category.parent_id).order_by(Category.id).all()
+
+        names = {}
+        nodes = {}
+        for category_id, name, parent_id in rows:
+            names[category_id] = name
+            nodes[category_id] = {'id': category_id, 'name': name, 'parent_id': parent_id, 'children': []}
+
+        # Organize categories with parent-child relationships (any depth, single pass)
+        category_tree = []
+        for node in nodes.values():
+            if node['parent_id'] is None:
+                category_tree.append(node)
+            elif node['parent_id'] in nodes:
+                nodes[node['parent_id']]['children'].append(node)
+
+        categories_data = [
+            {
+                'id': category_id,
+                'name': name,
+                'parent_id': parent_id,
+                'parent_name': names.get(parent_id)
+            }
+            for category_id, name, parent_id in rows
+        ]
+
+        return CategorySnapshot(
+            ids=frozenset(names),
+            tree_body=_serialize({'categories': category_tree, 'total': len(rows)}),
+            flat_body=_serialize({'categories': categories_data, 'total': len(rows)}),
+            loaded_at=time.monotonic(),
+            version=version
+        )
+
+def _serialize(data):
+    """Serialize data in the success_response envelope, exactly as jsonify would"""
+    return current_app.json.response({
+        'success': True,
+        'message': 'Success',
+        'data': data
+    }).get_data()
+
+def init_app(app):
+    """Attach a category cache to a Flask app"""
+    app.extensions['category_cache'] = CategoryCache(app.config.get('CATEGORY_CACHE_TTL', 60))
+
+def get_category_cache():
+    """Return the current app's category cache, creating it on first use"""
+    cache = current_app.extensions.get('category_cache')
+    if cache is None:
+        init_app(current_app)
+        cache = current_app.extensions['category_cache']
+    return cache
+
+def invalidate_categories():
+    """Drop cached categories after a write (no-op outside an app context)"""
+    try:
+        cache = current_app.extensions.get('category_cache')
+    except RuntimeError:
+        return
+    if cache is not None:
+        cache.invalidate()
+
+def category_exists(category_id):
+    """Check whether a category id exists without querying the database"""
+    try:
+        category_id = int(category_id)
+    except (TypeError, ValueError):
+        return False
+    
+    cache = get_category_cache()
+    if category_id in cache.get().ids:
+        return True
+    
+    # Miss: the category may have been created by another worker since our snapshot
+    from models import Category
+    if db.session.get(Category, category_id) is not None:
+        cache.invalidate()
+        return True
+    return False
@@ -0,0 +1,62 @@
+from flask import request, current_app, make_response, Response
+from database import db
+
+# Tables shared by every user; their counter is stored under user_id 0
+GLOBAL_TABLES = {'category'}
+
+GLOBAL_USER_ID = 0
+
+def _owner(table_name, user_id):
+    return GLOBAL_USER_ID if table_name in GLOBAL_TABLES or user_id is None else user_id
+
+def bump_version(table_name, user_id=None):
+    """Record a write to a table in the current DB transaction (commit with the write itself)"""
+    db.session.execute(db.text(
+        "INSERT INTO change_version (user_id, table_name, version) VALUES (:user_id, :table_name, 1) "
+        "ON CONFLICT (user_id, table_name) DO UPDATE SET version = version + 1"
+    ), {'user_id': _owner(table_name, user_id), 'table_name': table_name})
+
+def current_etag(user_id, *table_names):
+    """Weak ETag for a list built from the given tables, or None if versions cannot be read"""
+    owners = {table_name: _owner(table_name, user_id) for table_name in table_names}
+    try:
+        rows = db.session.execute(db.text(
+            "SELECT user_id, table_name, version FROM change_version "
+            "WHERE user_id IN (:user_id, :global_id) AND table_name IN :table_names"
+        ).bindparams(db.bindparam('table_names', expanding=True)), {
+            'user_id': user_id,
+            'global_id': GLOBAL_USER_ID,
+            'table_names': list(table_names)
+        }).all()
+    except Exception:
+        # e.g. a database created before the change_version table; serve without caching
+        db.session.rollback()
+        return None
+
+    versions = {(row_user_id, table_name): version for row_user_id, table_name, version in rows}
+    return ';'.join(
+        f"{table_name}:{owners[table_name]}:{versions.get((owners[table_name], table_name), 0)}"
+        for table_name in table_names
+    )
+
+def _cache_control():
+    max_age = current_app.config.get('LIST_CACHE_MAX_AGE', 0)
+    return f"private, max-age={max_age}" if max_age else 'private, no-cache'
+
+def not_modified(etag):
+    """304 response if the request's If-None-Match matches the ETag, else None"""
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = _cache_control()
+    return response
+
+def with_etag(rv, etag):
+    """Attach the ETag and Cache-Control headers to a view's return value"""
+    response = make_response(rv)
+    if etag is not None and response.status_code == 200:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = _cache_control()
+    return response
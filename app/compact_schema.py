@@ -0,0 +1,32 @@
+import logging
+from database import db
+from column_types import set_compact_schema
+
+schema_logger = logging.getLogger('budgetter_api.schema')
+
+def detect_compact_schema(connection):
+    """True/False from the declared type of transaction.amount, None if the table does not exist yet"""
+    for column in connection.exec_driver_sql('PRAGMA table_info("transaction")'):
+        if column[1] == 'amount':
+            return column[2].upper().startswith('INT')
+    return None
+
+def init_app(app):
+    """Pick the storage layout for money and codes (call after db.init_app and sqlite_profile.init_app)
+
+    An existing database keeps the layout it was created with; COMPACT_SCHEMA only
+    applies to databases whose tables do not exist yet.
+    """
+    configured = app.config.get('COMPACT_SCHEMA', True)
+    with app.app_context():
+        for engine in db.engines.values():
+            with engine.connect() as connection:
+                detected = detect_compact_schema(connection)
+
+            if detected is not None and detected != configured:
+                schema_logger.warning(
+                    f"COMPACT_SCHEMA is {configured} but {engine.url.database} uses the "
+                    f"{'compact' if detected else 'float/string'} layout; keeping the database layout"
+                )
+            # Per engine, so apps on databases with different layouts can share a process
+            set_compact_schema(engine.dialect, configured if detected is None else detected)
@@ -0,0 +1,196 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'application/javascript'
+)
+
+def _parse_accept_encoding(header):
+    """Map each accepted coding to its q-value (codings with q=0 are left out)"""
+    accepted = {}
+    for item in (header or '').split(','):
+        parts = item.strip().split(';')
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted[coding] = quality
+    return accepted
+
+class _GzipEncoder:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliEncoder:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class CompressionMiddleware:
+    """WSGI middleware that gzip/brotli-encodes responses the client accepts
+
+    Runs outside Flask, so every after_request hook (logging, metrics, ETags)
+    still sees the uncompressed response. Bodies with a known length are
+    compressed in one go when they reach min_size; streamed bodies (no
+    Content-Length) are compressed chunk by chunk and flushed after each
+    chunk so clients keep receiving data as it is produced.
+    """
+
+    def __init__(self, wsgi_app, min_size=1024, gzip_level=6, brotli_quality=4, mimetypes=DEFAULT_MIMETYPES):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.mimetypes = tuple(mimetypes)
+
+    def _choose_encoding(self, environ):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accepted = _parse_accept_encoding(environ.get('HTTP_ACCEPT_ENCODING'))
+        # Prefer brotli when both are equally acceptable (max() keeps the first)
+        candidates = [('gzip', accepted.get('gzip', accepted.get('*', 0)))]
+        if brotli is not None:
+            candidates.insert(0, ('br', accepted.get('br', accepted.get('*', 0))))
+        encoding, quality = max(candidates, key=lambda candidate: candidate[1])
+        return encoding if quality > 0 else None
+
+    def _encoder(self, encoding):
+        if encoding == 'br':
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    def _is_compressible(self, status, headers):
+        code = int(status.split(' ', 1)[0])
+        if code < 200 or code in (204, 206, 304):
+            return False
+        names = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in names or 'no-transform' in names.get('cache-control', ''):
+            return False
+        mimetype = names.get('content-type', '').split(';')[0].strip().lower()
+        return mimetype in self.mimetypes
+
+    def __call__(self, environ, start_response):
+        encoding = self._choose_encoding(environ)
+        if encoding is None:
+            return self.wsgi_app(environ, start_response)
+
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured['response'] = (status, headers, exc_info)
+            if not self._is_compressible(status, headers):
+                captured['passthrough'] = True
+                return start_response(status, headers, exc_info)
+            return _write_not_supported
+
+        app_iter = self.wsgi_app(environ, capture_start_response)
+        if 'response' not in captured or captured.get('passthrough'):
+            return app_iter
+
+        status, headers, exc_info = captured['response']
+        content_length = next((value for name, value in headers if name.lower() == 'content-length'), None)
+
+        if content_length is not None:
+            # Buffered body: compress in one go if it is worth it
+            try:
+                body = b''.join(app_iter)
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+
+            if len(body) < self.min_size:
+                start_response(status, _add_vary(headers), exc_info)
+                return [body]
+
+            encoder = self._encoder(encoding)
+            compressed = encoder.compress(body) + encoder.finish()
+            start_response(status, _encoded_headers(headers, encoding, len(compressed)), exc_info)
+            return [compressed]
+
+        start_response(status, _encoded_headers(headers, encoding), exc_info)
+        return self._stream(app_iter, self._encoder(encoding))
+
+    def _stream(self, app_iter, encoder):
+        try:
+            for chunk in app_iter:
+                data = encoder.compress(chunk) + encoder.flush()
+                if data:
+                    yield data
+            yield encoder.finish()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+def _write_not_supported(data):
+    raise RuntimeError("The WSGI write() callable is not supported for compressed responses")
+
+def _add_vary(headers):
+    vary = [value for name, value in headers if name.lower() == 'vary']
+    if any('accept-encoding' in value.lower() or value.strip() == '*' for value in vary):
+        return list(headers)
+    others = [(name, value) for name, value in headers if name.lower() != 'vary']
+    return others + [('Vary', ', '.join(vary + ['Accept-Encoding']))]
+
+def _encoded_headers(headers, encoding, content_length=None):
+    encoded = []
+    for name, value in _add_vary(headers):
+        lowered = name.lower()
+        if lowered == 'content-length':
+            continue
+        if lowered == 'etag' and not value.startswith('W/'):
+            # The encoded bytes differ from the identity ones, so the validator can only be weak
+            value = f"W/{value}"
+        encoded.append((name, value))
+    encoded.append(('Content-Encoding', encoding))
+    if content_length is not None:
+        encoded.append(('Content-Length', str(content_length)))
+    return encoded
+
+def init_app(app):
+    """Compress responses of a Flask app according to its COMPRESSION_* settings"""
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=app.config.get('COMPRESSION_MIN_SIZE', 1024),
+        gzip_level=app.config.get('COMPRESSION_GZIP_LEVEL', 6),
+        brotli_quality=app.config.get('COMPRESSION_BROTLI_QUALITY', 4),
+        mimetypes=app.config.get('COMPRESSION_MIMETYPES', DEFAULT_MIMETYPES)
+    )
@@ -8,6 +8,79 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # SQLite connection profile, applied as PRAGMAs on every new connection (see app/sqlite_profile.py).
+    # Set a value to None to keep SQLite's default for it.
+    SQLITE_PROFILE = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL',  # readers no longer block writers
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL',  # safe with WAL, fsync only at checkpoints
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,  # negative means KiB, so ~64 MB per connection
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,  # ms to wait on a locked database before "database is locked"
+        'foreign_keys': os.environ.get('SQLITE_FOREIGN_KEYS') or 'OFF'  # turn ON once existing rows satisfy the FKs
+    }
+    
+    # Store money as integer cents and type/frequency/period/status as small integer codes
+    # (see column_types.py). Only decides the layout of new databases; existing ones keep
+    # theirs until migrations/011_compact_money_and_codes.sql converts them.
+    COMPACT_SCHEMA = (os.environ.get('COMPACT_SCHEMA') or 'true').lower() == 'true'
+    
+    # Request logging: "verbose" (multi-line, human readable) or "structured" (one JSON line per request)
+    REQUEST_LOG_MODE = os.environ.get('REQUEST_LOG_MODE') or 'verbose'
+    REQUEST_LOG_BODY_SAMPLE_RATE = float(os.environ.get('REQUEST_LOG_BODY_SAMPLE_RATE') or 0.0)  # 0.0 - 1.0
+    REQUEST_LOG_BODY_MAX_BYTES = 1024
+    REQUEST_LOG_QUEUE_SIZE = 10000  # records beyond this are dropped rather than blocking requests
+    
+    # In-memory per-endpoint metrics, exported at /metrics
+    METRICS_ENABLED = True
+    METRICS_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    
+    # Per-request SQL statement counting (see app/query_stats.py)
+    QUERY_STATS_ENABLED = (os.environ.get('QUERY_STATS_ENABLED') or 'true').lower() == 'true'
+    QUERY_STATS_HEADERS = (os.environ.get('QUERY_STATS_HEADERS') or 'false').lower() == 'true'  # X-DB-Queries / X-DB-Time debug headers
+    QUERY_STATS_N_PLUS_ONE_THRESHOLD = 5  # identical statements per request before it is logged as a possible N+1 (0 = off)
+    QUERY_BUDGET_STRICT = False  # raise QueryBudgetExceeded instead of logging when a route exceeds its @query_budget
+    
+    # Slow query log (see app/slow_query_log.py): statements over SLOW_QUERY_MS are logged with
+    # their parameter types and EXPLAIN QUERY PLAN output (0 = off)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS') or 250)
+    SLOW_QUERY_EXPLAIN = (os.environ.get('SLOW_QUERY_EXPLAIN') or 'true').lower() == 'true'
+    
+    # On-demand cProfile of single requests (see app/request_profiler.py). A request sending
+    # X-Profile-Token: <PROFILER_TOKEN> is profiled, and the same header opens /api/admin/profiles.
+    # Both unset = off.
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
+    PROFILER_ENDPOINTS = [name.strip() for name in (os.environ.get('PROFILER_ENDPOINTS') or '').split(',') if name.strip()]  # always profiled, e.g. categories.get_categories
+    PROFILER_DIR = os.environ.get('PROFILER_DIR')  # default: <instance folder>/profiles
+    PROFILER_MAX_FILES = 50  # oldest profiles are deleted beyond this
+    
+    # POST /api/transactions/bulk limits
+    BULK_TRANSACTION_MAX_ROWS = 5000
+    BULK_TRANSACTION_CHUNK_SIZE = 500  # rows per INSERT/COMMIT
+    
+    # POST /api/goals/contributions limits
+    GOAL_CONTRIBUTION_MAX_ITEMS = 5000
+    GOAL_CONTRIBUTION_CHUNK_SIZE = 500  # goals per UPDATE/COMMIT
+    
+    # POST /api/transactions/import (bank statements)
+    STATEMENT_IMPORT_CHUNK_SIZE = 1000  # rows per INSERT/COMMIT
+    
+    # Seconds another worker's category writes may stay invisible to this process (0 = no expiry)
+    CATEGORY_CACHE_TTL = 60
+    
+    # Cache-Control max-age for ETag'd list endpoints (0 = clients revalidate every time)
+    LIST_CACHE_MAX_AGE = 0
+    
+    # Background thread that books recurring transactions as they come due (see app/recurring_scheduler.py)
+    RECURRING_SCHEDULER_ENABLED = (os.environ.get('RECURRING_SCHEDULER_ENABLED') or 'false').lower() == 'true'
+    RECURRING_SCHEDULER_RESYNC_SECONDS = 3600  # reload rules created by other processes
+    
+    # Response compression (gzip, plus brotli when the brotli package is installed)
+    COMPRESSION_ENABLED = (os.environ.get('COMPRESSION_ENABLED') or 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies are sent as-is (streams are always compressed)
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL') or 6)  # 1 (fast) - 9 (small)
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY') or 4)  # 0 - 11
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -18,6 +91,7 @@ class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///budget.db'
+    REQUEST_LOG_MODE = os.environ.get('REQUEST_LOG_MODE') or 'structured'
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -0,0 +1,208 @@
+import threading
+import time
+from flask import request, g
+
+# Upper bounds of the latency buckets in milliseconds (the last bucket is +Inf)
+DEFAULT_LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Upper bounds of the response size buckets in bytes (the last bucket is +Inf)
+DEFAULT_SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed on export)"""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside the matching bucket"""
+        if self.total == 0:
+            return None
+
+        rank = q * self.total
+        seen = 0
+        lower = 0.0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.bounds):
+                    # Overflow bucket has no upper bound, report the last finite one
+                    return float(self.bounds[-1])
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = self.bounds[i] if i < len(self.bounds) else lower
+        return float(self.bounds[-1])
+
+class EndpointStats:
+    """Latency, size and status counters for a single route"""
+
+    def __init__(self, latency_buckets, size_buckets):
+        self.latency = Histogram(latency_buckets)
+        self.response_size = Histogram(size_buckets)
+        self.status_counts = {}
+        self.errors = 0
+
+class MetricsRegistry:
+    """In-memory, thread-safe store of per-endpoint request metrics"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS_MS, size_buckets=DEFAULT_SIZE_BUCKETS_BYTES):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def observe(self, blueprint, route, method, status_code, duration_ms, response_bytes=None):
+        key = (blueprint, route, method)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = EndpointStats(self.latency_buckets, self.size_buckets)
+                self._endpoints[key] = stats
+
+            stats.latency.observe(duration_ms)
+            if response_bytes is not None:
+                stats.response_size.observe(response_bytes)
+
+            status_class = f"{status_code // 100}xx"
+            stats.status_counts[status_class] = stats.status_counts.get(status_class, 0) + 1
+            if status_code >= 500:
+                stats.errors += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self):
+        """Return a plain-dict summary of every endpoint (p50/p95/p99 in ms)"""
+        with self._lock:
+            summary = []
+            for (blueprint, route, method), stats in sorted(self._endpoints.items()):
+                total = stats.latency.total
+                summary.append({
+                    'blueprint': blueprint,
+                    'route': route,
+                    'method': method,
+                    'count': total,
+                    'errors': stats.errors,
+                    'error_rate': round(stats.errors / total, 4) if total else 0,
+                    'p50_ms': _round(stats.latency.quantile(0.5)),
+                    'p95_ms': _round(stats.latency.quantile(0.95)),
+                    'p99_ms': _round(stats.latency.quantile(0.99)),
+                    'status_counts': dict(stats.status_counts)
+                })
+            return summary
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+
+        with self._lock:
+            items = sorted(self._endpoints.items())
+
+            lines.append('# HELP budgetter_http_request_duration_seconds Request latency by endpoint.')
+            lines.append('# TYPE budgetter_http_request_duration_seconds histogram')
+            for key, stats in items:
+                labels = _labels(key)
+                _append_histogram(lines, 'budgetter_http_request_duration_seconds', labels, stats.latency, scale=1000.0)
+
+            lines.append('# HELP budgetter_http_request_duration_quantile_seconds Estimated latency quantiles by endpoint.')
+            lines.append('# TYPE budgetter_http_request_duration_quantile_seconds gauge')
+            for key, stats in items:
+                labels = _labels(key)
+                for q in self.QUANTILES:
+                    value = stats.latency.quantile(q)
+                    if value is not None:
+                        lines.append(f'budgetter_http_request_duration_quantile_seconds{{{labels},quantile="{q}"}} {value / 1000.0:.6f}')
+
+            lines.append('# HELP budgetter_http_requests_total Requests by endpoint and status class.')
+            lines.append('# TYPE budgetter_http_requests_total counter')
+            for key, stats in items:
+                labels = _labels(key)
+                for status_class, count in sorted(stats.status_counts.items()):
+                    lines.append(f'budgetter_http_requests_total{{{labels},status="{status_class}"}} {count}')
+
+            lines.append('# HELP budgetter_http_request_errors_total Requests that ended with a 5xx status.')
+            lines.append('# TYPE budgetter_http_request_errors_total counter')
+            for key, stats in items:
+                lines.append(f'budgetter_http_request_errors_total{{{_labels(key)}}} {stats.errors}')
+
+            lines.append('# HELP budgetter_http_response_size_bytes Response body size by endpoint.')
+            lines.append('# TYPE budgetter_http_response_size_bytes histogram')
+            for key, stats in items:
+                _append_histogram(lines, 'budgetter_http_response_size_bytes', _labels(key), stats.response_size)
+
+        return '\n'.join(lines) + '\n'
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(key):
+    blueprint, route, method = key
+    return f'blueprint="{_escape(blueprint)}",route="{_escape(route)}",method="{_escape(method)}"'
+
+def _format_bound(bound):
+    return f'{bound:g}'
+
+def _append_histogram(lines, name, labels, histogram, scale=1.0):
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound / scale)}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum / scale:.6f}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.total}')
+
+# Process-wide registry used by the request hooks and the /metrics endpoint
+registry = MetricsRegistry()
+
+def init_app(app):
+    """Record per-endpoint metrics for every request handled by a Flask app"""
+    global registry
+
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    registry = MetricsRegistry(
+        app.config.get('METRICS_LATENCY_BUCKETS_MS', DEFAULT_LATENCY_BUCKETS_MS),
+        app.config.get('METRICS_SIZE_BUCKETS_BYTES', DEFAULT_SIZE_BUCKETS_BYTES)
+    )
+
+    @app.before_request
+    def start_metrics_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        registry.observe(
+            request.blueprint or 'app',
+            route,
+            request.method,
+            response.status_code,
+            duration_ms,
+            None if response.is_streamed else response.calculate_content_length()
+        )
+        return response
@@ -0,0 +1,53 @@
+"""Book due recurring transactions (cron entry point)
+
+Every missed occurrence is booked with its own date, so running this late (or
+after downtime) catches up instead of under-booking. Safe to re-run at any
+time: rules that were already advanced are no longer due.
+
+    python -m app.process_recurring
+    python -m app.process_recurring --as-of 2026-10-31 --user-id 1
+
+Example crontab line (every night at 00:05):
+    5 0 * * * cd /path/to/budget_app_backend && python -m app.process_recurring
+"""
+import argparse
+import sys
+from datetime import datetime
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Book all due recurring transactions')
+    parser.add_argument('--as-of', help='book occurrences up to this date, YYYY-MM-DD (defaults to today)')
+    parser.add_argument('--user-id', type=int, help='only process this user\'s rules')
+    parser.add_argument('--batch-size', type=int, default=500, help='rules per database transaction')
+    parser.add_argument('--database', help='SQLAlchemy database URI (defaults to the app setting)')
+    args = parser.parse_args(argv)
+
+    as_of = None
+    if args.as_of:
+        try:
+            as_of = datetime.strptime(args.as_of, '%Y-%m-%d').date()
+        except ValueError:
+            parser.error('--as-of must be YYYY-MM-DD')
+
+    from app import create_app
+    from models_standard import RecurringTransactionProcessor
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database} if args.database else None)
+    with app.app_context():
+        summary = RecurringTransactionProcessor.process_due_recurring_transactions(
+            as_of=as_of,
+            user_id=args.user_id,
+            batch_size=args.batch_size
+        )
+
+    print(f"🔁 Rules processed: {summary['rules']}")
+    print(f"✅ Transactions booked: {summary['transactions']}")
+    if summary['skipped']:
+        print(f"⚠️  Rules skipped (unknown frequency): {summary['skipped']}")
+    if summary['conflicts']:
+        print(f"🔄 Batches retried after a concurrent run: {summary['conflicts']}")
+    print(f"⏱️  {summary['seconds']}s in {summary['batches']} batch(es)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import logging
+import time
+from collections import Counter
+from flask import request, g, has_request_context
+from sqlalchemy import event
+from database import db
+
+# Possible N+1 patterns and exceeded query budgets are logged here
+query_logger = logging.getLogger('budgetter_api.queries')
+
+class QueryBudgetExceeded(AssertionError):
+    """A route ran more SQL statements than its @query_budget allows (QUERY_BUDGET_STRICT only)"""
+
+class RequestQueryStats:
+    """SQL statements run while handling one request"""
+
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    @property
+    def time_ms(self):
+        return round(self.seconds * 1000, 2)
+
+    def repeated(self, threshold):
+        """(statement, times run) for statements run at least `threshold` times, most repeated first"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+def current_query_stats():
+    """Statistics of the current request, or None outside a request or when counting is off"""
+    return g.get('query_stats') if has_request_context() else None
+
+def query_budget(max_queries):
+    """Declare the most SQL statements a route may run (checked after each request)
+
+    Place it below the @route decorator:
+
+        @bp.route('/', methods=['GET'])
+        @query_budget(2)
+        def list_things(): ...
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_stats_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_stats_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    started = connection.info.get('query_stats_started') if connection is not None else None
+    if started:
+        started.pop()
+
+def attach_query_stats(engine):
+    """Count and time every statement the engine runs"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+def init_app(app):
+    """Count SQL statements per request (call after db.init_app)
+
+    Totals go to the X-DB-Queries / X-DB-Time headers (QUERY_STATS_HEADERS) and the
+    request log. Statements of streamed responses run after the request hooks, so
+    they are not included.
+    """
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            attach_query_stats(engine)
+
+    send_headers = app.config.get('QUERY_STATS_HEADERS', False)
+    n_plus_one_threshold = app.config.get('QUERY_STATS_N_PLUS_ONE_THRESHOLD', 5)
+    strict = app.config.get('QUERY_BUDGET_STRICT', False)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = RequestQueryStats()
+
+    @app.after_request
+    def finish_query_stats(response):
+        stats = g.get('query_stats')
+        if stats is None:
+            return response
+
+        if send_headers:
+            response.headers['X-DB-Queries'] = str(stats.count)
+            response.headers['X-DB-Time'] = f"{stats.time_ms:.2f}ms"
+
+        if n_plus_one_threshold:
+            for statement, count in stats.repeated(n_plus_one_threshold):
+                query_logger.warning(
+                    f"Possible N+1 in {request.endpoint}: statement ran {count} times: "
+                    f"{' '.join(statement.split())[:300]}"
+                )
+
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        if budget is not None and stats.count > budget:
+            message = f"{request.endpoint} ran {stats.count} SQL statements, its query budget is {budget}"
+            if strict:
+                raise QueryBudgetExceeded(message)
+            query_logger.warning(message)
+
+        return response
@@ -0,0 +1,41 @@
+"""Rebuild the monthly transaction rollup from the transaction table
+
+Run after importing data outside the API (raw SQL, restores) or to repair drift:
+    python -m app.rebuild_rollup
+    python -m app.rebuild_rollup --user-id 1
+"""
+import argparse
+import sys
+import time
+from database import db
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild transaction_monthly_rollup from the transaction table')
+    parser.add_argument('--user-id', type=int, help='only rebuild this user (defaults to everyone)')
+    parser.add_argument('--database', help='SQLAlchemy database URI (defaults to the app setting)')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from models import TransactionMonthlyRollup
+    from models_standard import MonthlyRollup
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database} if args.database else None)
+    with app.app_context():
+        # Creates the rollup table on databases that predate it
+        db.create_all()
+
+        started = time.perf_counter()
+        MonthlyRollup.rebuild(args.user_id)
+        db.session.commit()
+        elapsed = time.perf_counter() - started
+
+        query = db.session.query(TransactionMonthlyRollup.count)
+        if args.user_id is not None:
+            query = query.filter(TransactionMonthlyRollup.user_id == args.user_id)
+        row_count = query.count()
+
+    print(f"✅ Rebuilt {row_count} rollup rows in {elapsed:.3f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
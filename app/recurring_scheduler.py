@@ -0,0 +1,180 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import date, datetime
+from flask import current_app
+from database import db
+
+scheduler_logger = logging.getLogger('budgetter_api.scheduler')
+
+class RecurringScheduler:
+    """Background thread that books recurring transactions as they come due
+
+    Keeps a min-heap of (next_due_date, rule_id) for active rules and sleeps
+    until the earliest one is due, so only due rules are ever processed.
+    Changes made through recurring_bp call schedule()/unschedule(); entries
+    made stale by a change are skipped when they reach the top of the heap.
+    The heap is reloaded every resync_interval seconds to pick up rules that
+    other processes created. Every process that enables the scheduler runs
+    its own; the batch engine's compare-and-set advance keeps that safe.
+    """
+
+    def __init__(self, app, resync_interval=3600, retry_interval=60):
+        self.app = app
+        self.resync_interval = resync_interval
+        self.retry_interval = retry_interval
+        self._heap = []
+        self._due_dates = {}  # rule_id -> next_due_date of its live heap entry
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._loaded_at = None
+
+    # Heap maintenance (O(log n) per change)
+
+    def schedule(self, rule_id, next_due_date):
+        with self._condition:
+            self._due_dates[rule_id] = next_due_date
+            heapq.heappush(self._heap, (next_due_date, rule_id))
+            self._condition.notify()
+
+    def unschedule(self, rule_id):
+        with self._condition:
+            self._due_dates.pop(rule_id, None)
+            self._condition.notify()
+
+    def load(self):
+        """Rebuild the heap from the active rules in the database"""
+        from models import RecurringTransaction
+
+        rows = db.session.query(
+            RecurringTransaction.id,
+            RecurringTransaction.next_due_date
+        ).filter(RecurringTransaction.is_active == True).all()
+        db.session.remove()
+
+        with self._condition:
+            self._due_dates = {rule_id: next_due_date for rule_id, next_due_date in rows}
+            self._heap = [(next_due_date, rule_id) for rule_id, next_due_date in rows]
+            heapq.heapify(self._heap)
+            self._loaded_at = time.monotonic()
+
+    def _pop_due(self, today):
+        """Remove and return the ids of every rule due on or before today"""
+        due_ids = []
+        while self._heap and self._heap[0][0] <= today:
+            next_due_date, rule_id = heapq.heappop(self._heap)
+            if self._due_dates.get(rule_id) == next_due_date:
+                del self._due_dates[rule_id]
+                due_ids.append(rule_id)
+        return due_ids
+
+    def _next_due_date(self):
+        # Drop stale entries so the top of the heap is the real next due date
+        while self._heap and self._due_dates.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Thread
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='recurring-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stopped:
+                try:
+                    self.run_pending()
+                    wait = self._seconds_until_next_event()
+                except Exception:
+                    scheduler_logger.exception("Recurring scheduler iteration failed")
+                    db.session.rollback()
+                    wait = self.retry_interval
+
+                with self._condition:
+                    if not self._stopped:
+                        self._condition.wait(wait)
+
+    def run_pending(self):
+        """Reload the heap if it is due for a resync, then process every due rule"""
+        from models import RecurringTransaction
+        from models_standard import RecurringTransactionProcessor
+
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.resync_interval:
+            self.load()
+
+        today = date.today()
+        with self._condition:
+            due_ids = self._pop_due(today)
+        if not due_ids:
+            return None
+
+        summary = RecurringTransactionProcessor.process_due_recurring_transactions(as_of=today, rule_ids=due_ids)
+        scheduler_logger.info(
+            f"Booked {summary['transactions']} transactions for {summary['rules']} recurring rules"
+        )
+
+        # Re-queue the processed rules at their new due dates
+        rows = db.session.query(
+            RecurringTransaction.id,
+            RecurringTransaction.next_due_date
+        ).filter(
+            RecurringTransaction.id.in_(due_ids),
+            RecurringTransaction.is_active == True
+        ).all()
+        db.session.remove()
+        for rule_id, next_due_date in rows:
+            # Rules the engine could not advance (unknown frequency) wait for the next resync
+            if next_due_date > today:
+                self.schedule(rule_id, next_due_date)
+        return summary
+
+    def _seconds_until_next_event(self):
+        with self._condition:
+            next_due_date = self._next_due_date()
+        wait = self.resync_interval - (time.monotonic() - self._loaded_at)
+        if next_due_date is not None:
+            # Rules are due from midnight (server local time) of their due date
+            due_at = datetime.combine(next_due_date, datetime.min.time())
+            wait = min(wait, (due_at - datetime.now()).total_seconds())
+        return max(wait, 0.0)
+
+def init_app(app):
+    """Start the recurring scheduler for a Flask app if RECURRING_SCHEDULER_ENABLED is set"""
+    if not app.config.get('RECURRING_SCHEDULER_ENABLED', False):
+        return None
+
+    scheduler = RecurringScheduler(
+        app,
+        resync_interval=app.config.get('RECURRING_SCHEDULER_RESYNC_SECONDS', 3600)
+    )
+    app.extensions['recurring_scheduler'] = scheduler
+    scheduler.start()
+    return scheduler
+
+def notify_rule_changed(rule_id, next_due_date, is_active=True):
+    """Tell this process's scheduler (if running) about a created or edited rule"""
+    try:
+        scheduler = current_app.extensions.get('recurring_scheduler')
+    except RuntimeError:
+        return
+    if scheduler is None:
+        return
+
+    if is_active:
+        scheduler.schedule(rule_id, next_due_date)
+    else:
+        scheduler.unschedule(rule_id)
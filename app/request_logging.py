@@ -0,0 +1,114 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from flask import request, g
+from app.utils import mask_sensitive_data
+
+# Access log records are written as one compact JSON line each
+access_logger = logging.getLogger('budgetter_api.access')
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+_listener = None
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The message is already a JSON string, skip QueueHandler's re-formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def init_app(app):
+    """Register structured access logging hooks on a Flask app"""
+    global _listener
+
+    if app.config.get('REQUEST_LOG_MODE', 'verbose') != 'structured':
+        return
+
+    if _listener is None:
+        log_queue = queue.Queue(maxsize=app.config.get('REQUEST_LOG_QUEUE_SIZE', 10000))
+
+        # The background writer owns the actual (blocking) stream handler
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('%(message)s'))
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        access_logger.addHandler(DroppingQueueHandler(log_queue))
+
+    sample_rate = app.config.get('REQUEST_LOG_BODY_SAMPLE_RATE', 0.0)
+    max_body_bytes = app.config.get('REQUEST_LOG_BODY_MAX_BYTES', 1024)
+
+    @app.before_request
+    def start_access_record():
+        """Assign a request id and remember when the request started"""
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        g.access_start = time.perf_counter()
+
+    @app.after_request
+    def emit_access_record(response):
+        """Enqueue one compact record describing the request"""
+        try:
+            start = g.get('access_start')
+            duration = round((time.perf_counter() - start) * 1000, 2) if start else None
+
+            record = {
+                'ts': round(time.time(), 3),
+                'request_id': g.get('request_id'),
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': duration,
+                'ip': request.remote_addr,
+                'request_bytes': request.content_length or 0,
+                # None for streamed responses whose size is not known yet
+                'response_bytes': None if response.is_streamed else response.calculate_content_length()
+            }
+
+            query_stats = g.get('query_stats')
+            if query_stats is not None:
+                record['db_queries'] = query_stats.count
+                record['db_time_ms'] = query_stats.time_ms
+
+            if sample_rate and random.random() < sample_rate:
+                body = sample_request_body(max_body_bytes)
+                if body is not None:
+                    record['body'] = body
+
+            access_logger.info(json.dumps(record, separators=(',', ':')))
+            response.headers['X-Request-ID'] = record['request_id']
+        except Exception as e:
+            access_logger.error(f"Error in access logging: {str(e)}")
+
+        return response
+
+def sample_request_body(max_bytes):
+    """Return the masked request body, truncated to max_bytes"""
+    if request.method not in ['POST', 'PUT', 'PATCH'] or not request.is_json:
+        return None
+
+    body = request.get_json(silent=True)
+    if body is None:
+        return None
+
+    body_str = json.dumps(mask_sensitive_data(body), separators=(',', ':'))
+    if len(body_str) > max_bytes:
+        body_str = body_str[:max_bytes] + '...'
+    return body_str
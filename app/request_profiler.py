@@ -0,0 +1,141 @@
+import cProfile
+import hmac
+import logging
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from flask import current_app, request, g
+
+# Requests can ask to be profiled with this header, set to PROFILER_TOKEN
+PROFILE_HEADER = 'X-Profile-Token'
+
+# <UTC timestamp>_<endpoint>_<duration>ms_<id>.prof
+PROFILE_NAME = re.compile(r'^(\d{8}T\d{6})_([\w.]+)_(\d+)ms_([0-9a-f]{8})\.prof$')
+
+profiler_logger = logging.getLogger('budgetter_api.profiler')
+
+class ProfileStore:
+    """Profiling settings of one app and the .prof files it stores
+
+    directory is None while profiling is off for the app.
+    """
+
+    def __init__(self, directory=None, token=None, max_files=50):
+        self.directory = directory
+        self.token = token
+        self.max_files = max_files
+
+    def admin_enabled(self):
+        """Whether stored profiles can be listed (needs a PROFILER_TOKEN)"""
+        return bool(self.directory and self.token)
+
+    def token_matches(self, value):
+        """Whether value is the configured PROFILER_TOKEN (always False without one)"""
+        return bool(self.token and value) and hmac.compare_digest(value.encode(), self.token.encode())
+
+    def list_profiles(self):
+        """Stored profiles, newest first"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+
+        profiles = []
+        for name in os.listdir(self.directory):
+            match = PROFILE_NAME.match(name)
+            if not match:
+                continue
+            profiles.append({
+                'name': name,
+                'endpoint': match.group(2),
+                'duration_ms': int(match.group(3)),
+                'created_at': datetime.strptime(match.group(1), '%Y%m%dT%H%M%S').isoformat() + 'Z',
+                'size_bytes': os.path.getsize(os.path.join(self.directory, name))
+            })
+        return sorted(profiles, key=lambda profile: profile['name'], reverse=True)
+
+    def profile_path(self, name):
+        """Path of a stored profile, or None if the name is not one of ours"""
+        if not self.directory or not PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def _prune(self):
+        """Keep only the newest max_files profiles"""
+        for profile in self.list_profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, profile['name']))
+            except OSError:
+                pass
+
+    def save(self, profiler, endpoint, duration_ms):
+        """Write the profiler's stats and return the file name"""
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S}_{endpoint}_{int(duration_ms)}ms_{uuid.uuid4().hex[:8]}.prof"
+        profiler.dump_stats(os.path.join(self.directory, name))
+        self._prune()
+        return name
+
+def get_profile_store():
+    """Return the current app's profile store (profiling off if init_app was not called)"""
+    return current_app.extensions.get('request_profiler') or ProfileStore()
+
+def init_app(app):
+    """Run selected requests under cProfile and store the stats as .prof files
+
+    A request is profiled when it sends the X-Profile-Token header with the
+    configured PROFILER_TOKEN, or when its endpoint is in PROFILER_ENDPOINTS.
+    Profiling stops when the response is returned, so the body of streamed
+    responses is not included.
+    """
+    token = app.config.get('PROFILER_TOKEN') or None
+    endpoints = set(app.config.get('PROFILER_ENDPOINTS') or ())
+    if not token and not endpoints:
+        app.extensions['request_profiler'] = ProfileStore()
+        return
+
+    store = ProfileStore(
+        app.config.get('PROFILER_DIR') or os.path.join(app.instance_path, 'profiles'),
+        token,
+        app.config.get('PROFILER_MAX_FILES', 50)
+    )
+    os.makedirs(store.directory, exist_ok=True)
+    app.extensions['request_profiler'] = store
+
+    @app.before_request
+    def start_profiler():
+        if request.blueprint == 'profiles':
+            return
+        if request.endpoint not in endpoints and not store.token_matches(request.headers.get(PROFILE_HEADER)):
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        g.profiler = profiler
+        g.profiler_start = time.perf_counter()
+
+    @app.after_request
+    def save_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+
+        try:
+            duration_ms = (time.perf_counter() - g.profiler_start) * 1000
+            name = store.save(profiler, request.endpoint or 'unmatched', duration_ms)
+            response.headers['X-Profile-ID'] = name
+        except Exception as e:
+            profiler_logger.error(f"Error saving profile: {str(e)}")
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exception=None):
+        # after_request does not run when the request fails with an unhandled exception
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
@@ -2,7 +2,11 @@ from flask import Blueprint, request
 # JWT imports temporarily removed for testing
 # from flask_jwt_extended import jwt_required, get_jwt_identity
 from database import db
-from models import Budget, Category
+from models import Budget
+from models_standard import BudgetAnalytics
+from app.category_cache import category_exists
+from app.change_versions import bump_version, current_etag, not_modified, with_etag
+from app.query_stats import query_budget
 from app.utils import validate_amount, validate_date, success_response, error_response, require_json
 from datetime import datetime, date
 
@@ -10,6 +14,7 @@ budget_bp = Blueprint('budgets', __name__, url_prefix='/api/budgets')
 
 @budget_bp.route('/', methods=['GET'])
 # @jwt_required()  # Temporarily disabled
+@query_budget(2)
 def get_budgets():
     """
     Get user budgets
@@ -25,7 +30,12 @@ def get_budgets():
     # current_user_id = get_jwt_identity()  # Temporarily disabled
     current_user_id = 1  # Default user for testing
     
-    budgets = Budget.query.filter_by(user_id=current_user_id).all()
+    etag = current_etag(current_user_id, 'budget', 'category')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    budgets = Budget.query.options(db.joinedload(Budget.category)).filter_by(user_id=current_user_id).all()
     
     budgets_data = []
     for budget in budgets:
@@ -40,10 +50,39 @@ def get_budgets():
             'created_at': budget.created_at.isoformat() if budget.created_at else None
         })
     
-    return success_response({
+    return with_etag(success_response({
         'budgets': budgets_data,
         'total': len(budgets)
-    })
+    }), etag)
+
+@budget_bp.route('/status', methods=['GET'])
+# @jwt_required()  # Temporarily disabled
+def get_budgets_status():
+    """
+    Get spending status of all user budgets
+    ---
+    tags:
+      - Budgets
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Spent, remaining, percentage used and over-budget flag for every budget
+    """
+    # current_user_id = get_jwt_identity()  # Temporarily disabled
+    current_user_id = 1  # Default user for testing
+    
+    try:
+        statuses = BudgetAnalytics.get_all_budget_statuses(current_user_id)
+        
+        return success_response({
+            'budgets': statuses,
+            'total': len(statuses),
+            'over_budget_count': sum(1 for status in statuses if status['is_over_budget'])
+        })
+    
+    except Exception as e:
+        return error_response("Failed to retrieve budget status", 500)
 
 @budget_bp.route('/', methods=['POST'])
 # @jwt_required()  # Temporarily disabled
@@ -75,8 +114,7 @@ def create_budget():
         return error_response("All fields are required: category_id, amount_limit, period, start_date, end_date", 400)
     
     # Validate category
-    category = Category.query.get(category_id)
-    if not category:
+    if not category_exists(category_id):
         return error_response("Category not found", 400)
     
     # Validate amount
@@ -120,6 +158,7 @@ def create_budget():
         )
         
         db.session.add(budget)
+        bump_version('budget', current_user_id)
         db.session.commit()
         
         return success_response({
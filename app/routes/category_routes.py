@@ -3,10 +3,17 @@ from flask import Blueprint, request
 # from flask_jwt_extended import jwt_required, get_jwt_identity
 from database import db
 from models import Category
-from app.utils import success_response, error_response, require_json
+from models_standard import CategoryManager
+from app.utils import success_response, error_response, require_json, raw_json_response
+from app.category_cache import get_category_cache, invalidate_categories, category_exists
+from app.change_versions import bump_version, current_etag, not_modified, with_etag
+from app.query_stats import query_budget
 
 category_bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 
+# Sentinel for "parent_id not changed" (None means "move to top level")
+_UNCHANGED = object()
+
 @category_bp.route('/', methods=['GET'])
 # @jwt_required()  # Temporarily disabled
 def get_categories():
@@ -21,43 +28,20 @@ def get_categories():
       200:
         description: Categories retrieved successfully
     """
+    etag = current_etag(None, 'category')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
     try:
-        categories = Category.query.all()
-        
-        # Organize categories with parent-child relationships
-        category_tree = []
-        parent_categories = [cat for cat in categories if cat.parent_id is None]
-        
-        for parent in parent_categories:
-            parent_data = {
-                'id': parent.id,
-                'name': parent.name,
-                'parent_id': parent.parent_id,
-                'children': []
-            }
-            
-            # Get children
-            children = [cat for cat in categories if cat.parent_id == parent.id]
-            for child in children:
-                child_data = {
-                    'id': child.id,
-                    'name': child.name,
-                    'parent_id': child.parent_id
-                }
-                parent_data['children'].append(child_data)
-            
-            category_tree.append(parent_data)
-        
-        return success_response({
-            'categories': category_tree,
-            'total': len(categories)
-        })
+        return with_etag(raw_json_response(get_category_cache().get(etag).tree_body), etag)
     
     except Exception as e:
         return error_response("Failed to retrieve categories", 500)
 
 @category_bp.route('/flat', methods=['GET'])
 # @jwt_required()  # Temporarily disabled
+@query_budget(2)
 def get_categories_flat():
     """
     Get all categories as flat list
@@ -70,22 +54,13 @@ def get_categories_flat():
       200:
         description: Categories retrieved successfully
     """
+    etag = current_etag(None, 'category')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
     try:
-        categories = Category.query.all()
-        
-        categories_data = []
-        for category in categories:
-            categories_data.append({
-                'id': category.id,
-                'name': category.name,
-                'parent_id': category.parent_id,
-                'parent_name': category.parent.name if category.parent else None
-            })
-        
-        return success_response({
-            'categories': categories_data,
-            'total': len(categories)
-        })
+        return with_etag(raw_json_response(get_category_cache().get(etag).flat_body), etag)
     
     except Exception as e:
         return error_response("Failed to retrieve categories", 500)
@@ -136,8 +111,7 @@ def create_category():
     
     # Validate parent category exists if parent_id is provided
     if parent_id:
-        parent_category = Category.query.get(parent_id)
-        if not parent_category:
+        if not category_exists(parent_id):
             return error_response("Parent category not found", 400)
     
     try:
@@ -147,7 +121,11 @@ def create_category():
         )
         
         db.session.add(category)
+        db.session.flush()
+        CategoryManager.add_category_to_closure(category.id, parent_id)
+        bump_version('category')
         db.session.commit()
+        invalidate_categories()
         
         return success_response({
             'category': {
@@ -202,6 +180,7 @@ def update_category(category_id):
         return error_response("Category not found", 404)
     
     data = request.get_json()
+    moved_parent_id = _UNCHANGED
     
     if 'name' in data:
         new_name = data['name'].strip()
@@ -228,14 +207,23 @@ def update_category(category_id):
             return error_response("Category cannot be its own parent", 400)
         
         if parent_id:
-            parent_category = Category.query.get(parent_id)
-            if not parent_category:
+            if not category_exists(parent_id):
                 return error_response("Parent category not found", 400)
+            
+            if CategoryManager.is_descendant(parent_id, category_id):
+                return error_response("Category cannot be moved under its own subcategory", 400)
+        
+        if parent_id != category.parent_id:
+            moved_parent_id = parent_id or None
         
         category.parent_id = parent_id
     
     try:
+        if moved_parent_id is not _UNCHANGED:
+            CategoryManager.move_category_in_closure(category_id, moved_parent_id)
+        bump_version('category')
         db.session.commit()
+        invalidate_categories()
         return success_response({
             'category': {
                 'id': category.id,
@@ -290,8 +278,11 @@ def delete_category(category_id):
         return error_response("Cannot delete category that has budgets", 400)
     
     try:
+        CategoryManager.remove_category_from_closure(category_id)
         db.session.delete(category)
+        bump_version('category')
         db.session.commit()
+        invalidate_categories()
         return success_response(message="Category deleted successfully")
     
     except Exception as e:
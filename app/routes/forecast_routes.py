@@ -0,0 +1,48 @@
+from flask import Blueprint, request
+# JWT imports temporarily removed for testing
+# from flask_jwt_extended import jwt_required, get_jwt_identity
+from models_standard import CashFlowForecast
+from app.utils import success_response, error_response
+
+forecast_bp = Blueprint('forecast', __name__, url_prefix='/api/forecast')
+
+MAX_FORECAST_MONTHS = 120
+
+@forecast_bp.route('', methods=['GET'])
+# @jwt_required()  # Temporarily disabled
+def get_forecast():
+    """
+    Projected day-by-day balance from recurring transactions
+    ---
+    tags:
+      - Forecast
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: months
+        type: integer
+        default: 6
+        description: Forecast horizon in months (1-120)
+    responses:
+      200:
+        description: Forecast generated successfully
+      400:
+        description: Invalid months value
+    """
+    # current_user_id = get_jwt_identity()  # Temporarily disabled
+    current_user_id = 1  # Default user for testing
+    
+    try:
+        months = int(request.args.get('months', 6))
+    except (TypeError, ValueError):
+        months = 0
+    
+    if not 1 <= months <= MAX_FORECAST_MONTHS:
+        return error_response(f"months must be an integer between 1 and {MAX_FORECAST_MONTHS}", 400)
+    
+    try:
+        forecast = CashFlowForecast.forecast(current_user_id, months)
+        return success_response({'forecast': forecast})
+    except Exception as e:
+        return error_response("Failed to generate forecast", 500)
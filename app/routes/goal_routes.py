@@ -1,8 +1,11 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 # JWT imports temporarily removed for testing
 # from flask_jwt_extended import jwt_required, get_jwt_identity
 from database import db
 from models import Goal
+from column_types import GOAL_STATUSES
+from models_standard import GoalCalculations
+from app.change_versions import bump_version, current_etag, not_modified, with_etag
 from app.utils import validate_amount, validate_date, success_response, error_response, require_json
 
 goal_bp = Blueprint('goals', __name__, url_prefix='/api/goals')
@@ -24,6 +27,11 @@ def get_goals():
     # current_user_id = get_jwt_identity()  # Temporarily disabled
     current_user_id = 1  # Default user for testing
     
+    etag = current_etag(current_user_id, 'goal')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
     goals = Goal.query.filter_by(user_id=current_user_id).all()
     
     goals_data = []
@@ -41,10 +49,10 @@ def get_goals():
             'created_at': goal.created_at.isoformat() if goal.created_at else None
         })
     
-    return success_response({
+    return with_etag(success_response({
         'goals': goals_data,
         'total': len(goals)
-    })
+    }), etag)
 
 @goal_bp.route('/', methods=['POST'])
 # @jwt_required()  # Temporarily disabled
@@ -84,6 +92,11 @@ def create_goal():
         if not target_date:
             return error_response("Invalid date format. Use YYYY-MM-DD", 400)
     
+    # Validate status
+    status = data.get('status', 'active')
+    if status not in GOAL_STATUSES:
+        return error_response(f"Status must be one of: {', '.join(GOAL_STATUSES)}", 400)
+    
     try:
         goal = Goal(
             user_id=current_user_id,
@@ -91,10 +104,11 @@ def create_goal():
             target_amount=validated_amount,
             current_amount=data.get('current_amount', 0.0),
             target_date=target_date,
-            status=data.get('status', 'active')
+            status=status
         )
         
         db.session.add(goal)
+        bump_version('goal', current_user_id)
         db.session.commit()
         
         progress_percentage = (goal.current_amount / goal.target_amount * 100) if goal.target_amount > 0 else 0
@@ -115,3 +129,101 @@ def create_goal():
     except Exception as e:
         db.session.rollback()
         return error_response("Failed to create goal", 500)
+
+@goal_bp.route('/contributions', methods=['POST'])
+# @jwt_required()  # Temporarily disabled
+@require_json
+def contribute_to_goals():
+    """
+    Add contributions to one or more goals
+    ---
+    tags:
+      - Goals
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        schema:
+          type: object
+          required:
+            - contributions
+          properties:
+            contributions:
+              type: array
+              items:
+                type: object
+                properties:
+                  goal_id:
+                    type: integer
+                  amount:
+                    type: number
+    responses:
+      200:
+        description: At least one contribution was applied; per-item results are returned in request order
+      400:
+        description: Invalid payload or no valid contributions
+    """
+    # current_user_id = get_jwt_identity()  # Temporarily disabled
+    current_user_id = 1  # Default user for testing
+    data = request.get_json()
+    
+    items = data.get('contributions') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return error_response("A non-empty 'contributions' list is required", 400)
+    
+    max_items = current_app.config.get('GOAL_CONTRIBUTION_MAX_ITEMS', 5000)
+    if len(items) > max_items:
+        return error_response(f"At most {max_items} contributions can be sent at once", 400)
+    
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'status': 'error', 'error': "Each contribution must be an object"}
+            continue
+        try:
+            goal_id = int(item.get('goal_id'))
+        except (TypeError, ValueError):
+            results[index] = {'index': index, 'status': 'error', 'error': "A valid goal_id is required"}
+            continue
+        is_valid, amount = validate_amount(item.get('amount'))
+        if not is_valid:
+            results[index] = {'index': index, 'status': 'error', 'error': amount}
+            continue
+        valid.append((index, goal_id, amount))
+    
+    try:
+        updated = GoalCalculations.contribute(
+            [(goal_id, amount) for _, goal_id, amount in valid],
+            user_id=current_user_id,
+            chunk_size=current_app.config.get('GOAL_CONTRIBUTION_CHUNK_SIZE', 500)
+        )
+    except Exception as e:
+        return error_response("Failed to apply contributions", 500)
+    
+    for index, goal_id, amount in valid:
+        goal = updated.get(goal_id)
+        if goal is None:
+            results[index] = {'index': index, 'status': 'error', 'error': "Goal not found"}
+        else:
+            results[index] = {
+                'index': index,
+                'status': 'applied',
+                'goal_id': goal_id,
+                'amount': amount,
+                'current_amount': goal['current_amount'],
+                'goal_status': goal['status']
+            }
+    
+    applied = sum(1 for result in results if result['status'] == 'applied')
+    summary = {
+        'applied': applied,
+        'failed': len(items) - applied,
+        'results': results
+    }
+    
+    if not applied:
+        return error_response("No contributions were applied", 400, summary)
+    
+    return success_response(summary, f"{applied} of {len(items)} contributions applied")
@@ -0,0 +1,27 @@
+from flask import Blueprint, Response, request
+from app import metrics
+from app.utils import success_response
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/metrics')
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """
+    Per-endpoint request metrics
+    ---
+    tags:
+      - Monitoring
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [prometheus, json]
+        default: prometheus
+    responses:
+      200:
+        description: Latency histograms, request counts, error rates and response sizes
+    """
+    if request.args.get('format') == 'json':
+        return success_response({'endpoints': metrics.registry.snapshot()})
+
+    return Response(metrics.registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,103 @@
+import io
+import pstats
+from flask import Blueprint, Response, request, send_file
+from app import request_profiler
+from app.utils import success_response, error_response
+
+profiles_bp = Blueprint('profiles', __name__, url_prefix='/api/admin/profiles')
+
+# Functions shown by ?format=text
+DEFAULT_TEXT_LIMIT = 40
+
+def check_admin_token(store):
+    """Error response unless the request carries the profiler token"""
+    if not store.admin_enabled():
+        return error_response("Profiling is not enabled", 404)
+    if not store.token_matches(request.headers.get(request_profiler.PROFILE_HEADER)):
+        return error_response("Invalid or missing profiler token", 403)
+    return None
+
+@profiles_bp.route('', methods=['GET'])
+def list_request_profiles():
+    """
+    List stored request profiles
+    ---
+    tags:
+      - Monitoring
+    parameters:
+      - in: header
+        name: X-Profile-Token
+        type: string
+        required: true
+    responses:
+      200:
+        description: Stored profiles, newest first
+      403:
+        description: Invalid or missing profiler token
+      404:
+        description: Profiling is not enabled
+    """
+    store = request_profiler.get_profile_store()
+    denied = check_admin_token(store)
+    if denied:
+        return denied
+
+    profiles = store.list_profiles()
+    return success_response({'profiles': profiles, 'total': len(profiles)})
+
+@profiles_bp.route('/<name>', methods=['GET'])
+def get_request_profile(name):
+    """
+    Download a stored request profile
+    ---
+    tags:
+      - Monitoring
+    parameters:
+      - in: path
+        name: name
+        type: string
+        required: true
+      - in: header
+        name: X-Profile-Token
+        type: string
+        required: true
+      - in: query
+        name: format
+        type: string
+        enum: [pstats, text]
+        default: pstats
+        description: pstats returns the .prof file (for snakeviz, flameprof, gprof2dot...), text the slowest functions
+      - in: query
+        name: limit
+        type: integer
+        default: 40
+        description: Number of functions in the text report
+    responses:
+      200:
+        description: The profile
+      403:
+        description: Invalid or missing profiler token
+      404:
+        description: Profile not found
+    """
+    store = request_profiler.get_profile_store()
+    denied = check_admin_token(store)
+    if denied:
+        return denied
+
+    path = store.profile_path(name)
+    if not path:
+        return error_response("Profile not found", 404)
+
+    if request.args.get('format') == 'text':
+        try:
+            limit = int(request.args.get('limit', DEFAULT_TEXT_LIMIT))
+        except ValueError:
+            return error_response("limit must be an integer", 400)
+
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.sort_stats('cumulative').print_stats(max(limit, 1))
+        return Response(output.getvalue(), mimetype='text/plain')
+
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True, download_name=name)
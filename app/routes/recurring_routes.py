@@ -2,13 +2,18 @@ from flask import Blueprint, request
 # JWT imports temporarily removed for testing
 # from flask_jwt_extended import jwt_required, get_jwt_identity
 from database import db
-from models import RecurringTransaction, Category
+from models import RecurringTransaction
+from app.category_cache import category_exists
+from app.change_versions import bump_version, current_etag, not_modified, with_etag
+from app.query_stats import query_budget
+from app.recurring_scheduler import notify_rule_changed
 from app.utils import validate_amount, validate_date, success_response, error_response, require_json
 
 recurring_bp = Blueprint('recurring', __name__, url_prefix='/api/recurring-transactions')
 
 @recurring_bp.route('/', methods=['GET'])
 # @jwt_required()  # Temporarily disabled
+@query_budget(2)
 def get_recurring_transactions():
     """
     Get user recurring transactions
@@ -24,7 +29,14 @@ def get_recurring_transactions():
     # current_user_id = get_jwt_identity()  # Temporarily disabled
     current_user_id = 1  # Default user for testing
     
-    recurring_transactions = RecurringTransaction.query.filter_by(user_id=current_user_id).all()
+    etag = current_etag(current_user_id, 'recurring_transaction', 'category')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    recurring_transactions = RecurringTransaction.query.options(
+        db.joinedload(RecurringTransaction.category)
+    ).filter_by(user_id=current_user_id).all()
     
     transactions_data = []
     for transaction in recurring_transactions:
@@ -41,10 +53,10 @@ def get_recurring_transactions():
             'created_at': transaction.created_at.isoformat() if transaction.created_at else None
         })
     
-    return success_response({
+    return with_etag(success_response({
         'recurring_transactions': transactions_data,
         'total': len(recurring_transactions)
-    })
+    }), etag)
 
 @recurring_bp.route('/', methods=['POST'])
 # @jwt_required()  # Temporarily disabled
@@ -76,8 +88,7 @@ def create_recurring_transaction():
         return error_response("All fields are required: category_id, amount, type, frequency, next_due_date", 400)
     
     # Validate category
-    category = Category.query.get(category_id)
-    if not category:
+    if not category_exists(category_id):
         return error_response("Category not found", 400)
     
     # Validate amount
@@ -106,12 +117,15 @@ def create_recurring_transaction():
             type=transaction_type,
             frequency=frequency,
             next_due_date=next_due_date,
+            anchor_day=next_due_date.day,
             is_active=data.get('is_active', True),
             description=data.get('description', '').strip() or None
         )
         
         db.session.add(recurring_transaction)
+        bump_version('recurring_transaction', current_user_id)
         db.session.commit()
+        notify_rule_changed(recurring_transaction.id, recurring_transaction.next_due_date, recurring_transaction.is_active)
         
         return success_response({
             'recurring_transaction': {
@@ -131,3 +145,120 @@ def create_recurring_transaction():
     except Exception as e:
         db.session.rollback()
         return error_response("Failed to create recurring transaction", 500)
+
+@recurring_bp.route('/<int:recurring_id>', methods=['PUT'])
+# @jwt_required()  # Temporarily disabled
+@require_json
+def update_recurring_transaction(recurring_id):
+    """
+    Update or deactivate a recurring transaction
+    ---
+    tags:
+      - Recurring Transactions
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: recurring_id
+        type: integer
+        required: true
+      - in: body
+        name: body
+        schema:
+          type: object
+          properties:
+            category_id:
+              type: integer
+            amount:
+              type: number
+            type:
+              type: string
+              enum: [income, expense]
+            frequency:
+              type: string
+              enum: [daily, weekly, monthly, yearly]
+            next_due_date:
+              type: string
+              format: date
+            is_active:
+              type: boolean
+            description:
+              type: string
+    responses:
+      200:
+        description: Recurring transaction updated successfully
+      404:
+        description: Recurring transaction not found
+      400:
+        description: Validation error
+    """
+    # current_user_id = get_jwt_identity()  # Temporarily disabled
+    current_user_id = 1  # Default user for testing
+    
+    recurring_transaction = RecurringTransaction.query.filter_by(id=recurring_id, user_id=current_user_id).first()
+    if not recurring_transaction:
+        return error_response("Recurring transaction not found", 404)
+    
+    data = request.get_json()
+    
+    if 'category_id' in data:
+        if not category_exists(data['category_id']):
+            return error_response("Category not found", 400)
+        recurring_transaction.category_id = int(data['category_id'])
+    
+    if 'amount' in data:
+        is_valid, validated_amount = validate_amount(data['amount'])
+        if not is_valid:
+            return error_response(validated_amount, 400)
+        recurring_transaction.amount = validated_amount
+    
+    if 'type' in data:
+        if data['type'] not in ['income', 'expense']:
+            return error_response("Type must be 'income' or 'expense'", 400)
+        recurring_transaction.type = data['type']
+    
+    if 'frequency' in data:
+        if data['frequency'] not in ['daily', 'weekly', 'monthly', 'yearly']:
+            return error_response("Frequency must be 'daily', 'weekly', 'monthly', or 'yearly'", 400)
+        recurring_transaction.frequency = data['frequency']
+    
+    if 'next_due_date' in data:
+        next_due_date = validate_date(data['next_due_date']) if isinstance(data['next_due_date'], str) else None
+        if not next_due_date:
+            return error_response("Invalid date format. Use YYYY-MM-DD", 400)
+        recurring_transaction.next_due_date = next_due_date
+        recurring_transaction.anchor_day = next_due_date.day
+    
+    if 'is_active' in data:
+        if not isinstance(data['is_active'], bool):
+            return error_response("is_active must be true or false", 400)
+        recurring_transaction.is_active = data['is_active']
+    
+    if 'description' in data:
+        if data['description'] is not None and not isinstance(data['description'], str):
+            return error_response("Description must be a string", 400)
+        recurring_transaction.description = (data['description'] or '').strip() or None
+    
+    try:
+        bump_version('recurring_transaction', current_user_id)
+        db.session.commit()
+        notify_rule_changed(recurring_transaction.id, recurring_transaction.next_due_date, recurring_transaction.is_active)
+        
+        return success_response({
+            'recurring_transaction': {
+                'id': recurring_transaction.id,
+                'category_id': recurring_transaction.category_id,
+                'category_name': recurring_transaction.category.name if recurring_transaction.category else None,
+                'amount': recurring_transaction.amount,
+                'type': recurring_transaction.type,
+                'frequency': recurring_transaction.frequency,
+                'next_due_date': recurring_transaction.next_due_date.isoformat(),
+                'is_active': recurring_transaction.is_active,
+                'description': recurring_transaction.description,
+                'created_at': recurring_transaction.created_at.isoformat() if recurring_transaction.created_at else None
+            }
+        }, "Recurring transaction updated successfully")
+    
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to update recurring transaction", 500)
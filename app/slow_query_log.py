@@ -0,0 +1,109 @@
+import logging
+import re
+import time
+from flask import request, has_request_context
+from sqlalchemy import event
+from database import db
+
+# Statements slower than SLOW_QUERY_MS, with their query plan
+slow_query_logger = logging.getLogger('budgetter_api.slow_queries')
+
+# Statements SQLite can EXPLAIN (PRAGMA, BEGIN, DDL... are skipped)
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b', re.IGNORECASE)
+
+# "SCAN transaction" without "USING ... INDEX" reads every row of the table
+FULL_SCAN = re.compile(r'^SCAN (\S+)(?!.*\bUSING\b.*\bINDEX\b)')
+
+# CTEs and subqueries are named in the plan too, but scanning them is not a table scan
+SUBQUERY = re.compile(r'^(?:CO-ROUTINE|MATERIALIZE) (\S+)')
+
+def redact_parameters(parameters):
+    """Parameter types only, so amounts, notes and emails never reach the log"""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+def explain_query_plan(dbapi_connection, statement, parameters):
+    """SQLite's EXPLAIN QUERY PLAN as indented lines (empty if it cannot be explained)"""
+    if not EXPLAINABLE.match(statement):
+        return []
+
+    cursor = dbapi_connection.cursor()
+    try:
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    finally:
+        cursor.close()
+
+    # Rows are (id, parent, notused, detail); nesting comes from parent ids
+    depths = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append('  ' * depths[node_id] + detail)
+    return lines
+
+def full_scans(plan):
+    """Tables the plan reads in full"""
+    subqueries = {match.group(1) for match in (SUBQUERY.match(line.strip()) for line in plan) if match}
+    tables = []
+    for line in plan:
+        match = FULL_SCAN.match(line.strip())
+        if match and match.group(1) not in subqueries and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return tables
+
+def attach_slow_query_log(engine, threshold_ms, explain=True):
+    """Log statements on this engine that take longer than threshold_ms"""
+    threshold = threshold_ms / 1000
+    explain = explain and engine.dialect.name == 'sqlite'
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'slow_query_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold:
+            return
+
+        try:
+            if has_request_context():
+                route = f"{request.method} {request.endpoint or request.path}"
+            else:
+                route = '(no request)'
+
+            message = [
+                f"Slow query ({elapsed * 1000:.1f} ms) in {route}: {' '.join(statement.split())}",
+                f"   params: {'executemany' if executemany else redact_parameters(parameters)}"
+            ]
+
+            # executemany statements have a list of parameter sets; their plan is the same for each
+            if explain and not executemany:
+                plan = explain_query_plan(cursor.connection, statement, parameters)
+                if plan:
+                    message.append("   plan:")
+                    message.extend(f"     {line}" for line in plan)
+                scanned = full_scans(plan)
+                if scanned:
+                    message.append(f"   full table scan of: {', '.join(scanned)}")
+
+            slow_query_logger.warning('\n'.join(message))
+        except Exception as e:
+            slow_query_logger.error(f"Error logging slow query: {str(e)}")
+
+def init_app(app):
+    """Attach the slow query log to the app's engines (call after db.init_app)"""
+    threshold_ms = app.config.get('SLOW_QUERY_MS', 0)
+    if not threshold_ms:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            attach_slow_query_log(engine, threshold_ms, app.config.get('SLOW_QUERY_EXPLAIN', True))
@@ -0,0 +1,37 @@
+from sqlalchemy import event
+from database import db
+
+# PRAGMAs are applied in this order; busy_timeout goes first so that switching
+# the journal mode waits for other connections instead of failing immediately
+PRAGMA_ORDER = ['busy_timeout', 'journal_mode', 'synchronous', 'foreign_keys', 'cache_size', 'mmap_size', 'temp_store']
+
+def apply_sqlite_profile(dbapi_connection, profile):
+    """Run the profile's PRAGMA statements on a raw sqlite3 connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in PRAGMA_ORDER:
+            value = profile.get(name)
+            if value is None:
+                continue
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+def attach_sqlite_profile(engine, profile):
+    """Apply the profile to every new connection the engine opens"""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_profile(dbapi_connection, profile)
+
+def init_app(app):
+    """Attach the configured SQLite profile to the app's engines (call after db.init_app)"""
+    profile = app.config.get('SQLITE_PROFILE')
+    if not profile:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            attach_sqlite_profile(engine, profile)
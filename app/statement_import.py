@@ -0,0 +1,262 @@
+"""Bank statement import (CSV and OFX)
+
+Statements are parsed incrementally as a stream of rows, mapped to
+Transaction values with validate_amount/validate_date semantics and written
+in fixed-size chunks, so a multi-year export never has to fit in memory.
+
+CLI usage (back-office backfills):
+    python -m app.statement_import statement.csv --user-id 1
+    python -m app.statement_import statement.ofx --user-id 1 --chunk-size 1000
+"""
+import argparse
+import csv
+import re
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from database import db
+from app.utils import validate_amount, validate_date
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Keep this many row errors in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+DEFAULT_CSV_COLUMNS = {
+    'date': 'date',
+    'amount': 'amount',
+    'type': 'type',
+    'note': 'description',
+    'category_id': 'category_id'
+}
+
+OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<]*)')
+
+def detect_format(filename):
+    """Guess the statement format from a file name ('csv' or 'ofx')"""
+    name = (filename or '').lower()
+    if name.endswith('.ofx') or name.endswith('.qfx'):
+        return 'ofx'
+    return 'csv'
+
+def iter_csv_rows(stream, columns=None):
+    """Yield raw rows from a CSV text stream, renamed to date/amount/type/note/category_id"""
+    columns = dict(DEFAULT_CSV_COLUMNS, **(columns or {}))
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield {
+            field: (record.get(column) or '').strip() or None
+            for field, column in columns.items()
+        }
+
+def iter_ofx_rows(stream, read_size=65536):
+    """Yield raw rows from the STMTTRN blocks of an OFX (SGML or XML) text stream"""
+    buffer = ''
+    current = None
+    while True:
+        chunk = stream.read(read_size)
+        buffer += chunk
+        consumed = 0
+        for match in OFX_TAG.finditer(buffer):
+            # A tag at the very end of the buffer may still be missing part of its value
+            if chunk and match.end() == len(buffer):
+                break
+            consumed = match.end()
+            closing, tag, value = match.group(1), match.group(2).upper(), match.group(3).strip()
+
+            if tag == 'STMTTRN':
+                if closing:
+                    if current is not None:
+                        yield _ofx_row(current)
+                    current = None
+                else:
+                    current = {}
+            elif current is not None and not closing and value:
+                current[tag] = value
+        buffer = buffer[consumed:]
+        if not chunk:
+            break
+
+    if current:
+        yield _ofx_row(current)
+
+def _ofx_row(fields):
+    posted = fields.get('DTPOSTED', '')
+    return {
+        # DTPOSTED is YYYYMMDD optionally followed by a time and timezone
+        'date': f"{posted[0:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else None,
+        'amount': fields.get('TRNAMT'),
+        'type': None,
+        'note': fields.get('NAME') or fields.get('MEMO'),
+        'category_id': None
+    }
+
+def map_row(raw, user_id, date_format=None, default_category_id=None):
+    """Map a raw statement row to Transaction column values; returns (values, error)"""
+    amount = raw.get('amount')
+    if amount is None:
+        return None, "Amount is required"
+    try:
+        signed_amount = float(str(amount).replace(',', ''))
+    except ValueError:
+        return None, "Invalid amount format"
+
+    transaction_type = (raw.get('type') or '').lower() or None
+    if transaction_type is None:
+        # Statements usually sign amounts: money out is negative
+        transaction_type = 'expense' if signed_amount < 0 else 'income'
+    elif transaction_type not in ['income', 'expense']:
+        return None, "Type must be 'income' or 'expense'"
+
+    is_valid, validated_amount = validate_amount(abs(signed_amount))
+    if not is_valid:
+        return None, validated_amount
+
+    raw_date = raw.get('date')
+    if not raw_date:
+        return None, "Date is required"
+    if date_format:
+        try:
+            transaction_date = datetime.strptime(raw_date, date_format).date()
+        except ValueError:
+            transaction_date = None
+    else:
+        transaction_date = validate_date(raw_date)
+    if not transaction_date:
+        return None, f"Invalid date format. Use {date_format or 'YYYY-MM-DD'}"
+
+    category_id = raw.get('category_id') or default_category_id
+    if category_id is not None:
+        try:
+            category_id = int(category_id)
+        except (TypeError, ValueError):
+            return None, "Invalid category_id"
+
+    note = raw.get('note')
+    return {
+        'user_id': user_id,
+        'amount': validated_amount,
+        'type': transaction_type,
+        'category_id': category_id,
+        'date': transaction_date,
+        'note': note[:200] if note else None
+    }, None
+
+def import_rows(rows, user_id, chunk_size=DEFAULT_CHUNK_SIZE, date_format=None, default_category_id=None):
+    """Validate and insert a stream of raw rows in chunks; returns an import report"""
+    from models import Category, Transaction
+    from models_standard import MonthlyRollup
+
+    known_category_ids = {category_id for (category_id,) in db.session.query(Category.id)}
+    statement = insert(Transaction)
+
+    report = {'rows': 0, 'imported': 0, 'failed': 0, 'errors': [], 'last_committed_row': None}
+    started = time.perf_counter()
+    chunk = []
+    line_number = 0
+
+    def flush():
+        try:
+            db.session.execute(statement, chunk)
+            MonthlyRollup.apply(chunk)
+            db.session.commit()
+            report['imported'] += len(chunk)
+            report['last_committed_row'] = line_number
+        except Exception as e:
+            db.session.rollback()
+            report['failed'] += len(chunk)
+            _add_error(report, None, f"Failed to insert {len(chunk)} rows")
+
+    rows = iter(rows)
+    while True:
+        # Rows are decoded and parsed lazily, so a bad byte or broken quoting surfaces here,
+        # possibly after earlier chunks were committed. Stop and say where.
+        try:
+            raw = next(rows)
+        except StopIteration:
+            break
+        except UnicodeDecodeError:
+            report['stopped_at_row'] = line_number + 1
+            _add_error(report, line_number + 1, "Statement is not valid UTF-8 text")
+            break
+        except csv.Error as e:
+            report['stopped_at_row'] = line_number + 1
+            _add_error(report, line_number + 1, f"Invalid CSV: {str(e)}")
+            break
+
+        line_number += 1
+        report['rows'] += 1
+        values, error = map_row(raw, user_id, date_format, default_category_id)
+        if not error and values['category_id'] is not None and values['category_id'] not in known_category_ids:
+            error = "Category not found"
+        if error:
+            report['failed'] += 1
+            _add_error(report, line_number, error)
+            continue
+
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            flush()
+            chunk = []
+
+    if chunk:
+        flush()
+
+    elapsed = time.perf_counter() - started
+    report['seconds'] = round(elapsed, 3)
+    report['rows_per_second'] = round(report['rows'] / elapsed, 1) if elapsed > 0 else None
+    return report
+
+def _add_error(report, row, message):
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({'row': row, 'error': message})
+
+def import_statement(stream, user_id, statement_format='csv', columns=None, **options):
+    """Import a CSV or OFX text stream for a user"""
+    if statement_format == 'ofx':
+        rows = iter_ofx_rows(stream)
+    else:
+        rows = iter_csv_rows(stream, columns)
+    return import_rows(rows, user_id, **options)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import a bank statement (CSV or OFX) into the transaction table')
+    parser.add_argument('path')
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--format', choices=['csv', 'ofx'], help='defaults to the file extension')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--date-format', help="strptime format of the date column, e.g. '%%d/%%m/%%Y'")
+    parser.add_argument('--category-id', type=int, help='category for rows that do not have one')
+    parser.add_argument('--database', help='SQLAlchemy database URI (defaults to the app setting)')
+    for field, column in DEFAULT_CSV_COLUMNS.items():
+        parser.add_argument(f"--{field.replace('_', '-')}-column", default=column, help=f"CSV header for {field}")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database} if args.database else None)
+    columns = {field: getattr(args, f"{field}_column") for field in DEFAULT_CSV_COLUMNS}
+
+    with app.app_context(), open(args.path, 'r', encoding='utf-8-sig', newline='') as stream:
+        report = import_statement(
+            stream,
+            args.user_id,
+            args.format or detect_format(args.path),
+            columns,
+            chunk_size=args.chunk_size,
+            date_format=args.date_format,
+            default_category_id=args.category_id
+        )
+
+    print(f"📄 Rows read: {report['rows']}")
+    print(f"✅ Imported: {report['imported']}")
+    print(f"❌ Failed: {report['failed']}")
+    if 'stopped_at_row' in report:
+        print(f"⚠️  Stopped at row {report['stopped_at_row']}; rows up to {report['last_committed_row']} were committed")
+    for error in report['errors'][:20]:
+        print(f"   row {error['row']}: {error['error']}")
+    print(f"⏱️  {report['seconds']}s ({report['rows_per_second']} rows/s)")
+    return 0 if report['imported'] or not report['rows'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,11 @@
 from functools import wraps
-from flask import jsonify, request
+from flask import jsonify, request, Response
 # JWT imports temporarily removed for testing
 # from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, date
+from sqlalchemy import tuple_
+import base64
+import json
 import re
 
 def validate_email(email):
@@ -43,6 +46,10 @@ def success_response(data=None, message="Success", status_code=200):
         response['data'] = data
     return jsonify(response), status_code
 
+def raw_json_response(body, status_code=200):
+    """Response for a JSON body that has already been serialized to bytes"""
+    return Response(body, status=status_code, mimetype='application/json')
+
 def error_response(message="An error occurred", status_code=400, errors=None):
     """Standard error response format"""
     response = {
@@ -53,6 +60,20 @@ def error_response(message="An error occurred", status_code=400, errors=None):
         response['errors'] = errors
     return jsonify(response), status_code
 
+def mask_sensitive_data(data):
+    """Mask sensitive fields in request/response data"""
+    if not isinstance(data, dict):
+        return data
+    
+    sensitive_fields = ['password', 'password_hash', 'current_password', 'new_password', 'access_token', 'refresh_token']
+    masked_data = data.copy()
+    
+    for field in sensitive_fields:
+        if field in masked_data:
+            masked_data[field] = "***MASKED***"
+    
+    return masked_data
+
 def paginate_query(query, page=1, per_page=20):
     """Paginate SQLAlchemy query"""
     try:
@@ -78,6 +99,78 @@ def paginate_query(query, page=1, per_page=20):
     except Exception as e:
         return None
 
+def encode_cursor(values):
+    """Encode keyset values into an opaque, URL-safe cursor string"""
+    payload = json.dumps([DateTimeEncoder.serialize_datetime(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor produced by encode_cursor back into typed column values"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw_values, list) or len(raw_values) != len(columns):
+            return None
+        
+        values = []
+        for column, raw in zip(columns, raw_values):
+            python_type = column.type.python_type
+            if raw is None:
+                return None
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(raw))
+            elif python_type is date:
+                values.append(date.fromisoformat(raw))
+            else:
+                values.append(python_type(raw))
+        return values
+    except Exception:
+        return None
+
+def paginate_keyset(query, columns, cursor=None, per_page=20):
+    """Paginate SQLAlchemy query by keyset (newest first) instead of LIMIT/OFFSET
+    
+    `columns` is the ordered sort key, which must be unique when taken together
+    (end it with the primary key). Keys must never be NULL and must compare the
+    same way whatever format a row was written in, so wrap such columns in an
+    expression (see get_transactions). The next cursor is built from the key
+    values the database returned, not from Python attributes. No COUNT query is
+    issued, so every page costs the same as the first one as long as an index
+    covers the sort key.
+    """
+    try:
+        per_page = int(per_page) if per_page else 20
+        per_page = min(per_page, 100)  # Max 100 items per page
+        if per_page < 1:
+            return None
+        
+        if cursor:
+            values = decode_cursor(cursor, columns)
+            if values is None:
+                return None
+            query = query.filter(tuple_(*columns) < tuple_(*values))
+        
+        query = query.order_by(*[column.desc() for column in columns])
+        
+        # Fetch one extra row to find out whether there is a next page
+        rows = query.add_columns(*columns).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        items = [row[0] for row in rows]
+        
+        next_cursor = None
+        if has_next:
+            next_cursor = encode_cursor(list(rows[-1][1:]))
+        
+        return {
+            'items': items,
+            'per_page': per_page,
+            'has_next': has_next,
+            'next_cursor': next_cursor
+        }
+    except Exception as e:
+        return None
+
 def require_json(f):
     """Decorator to ensure request contains JSON data"""
     @wraps(f)
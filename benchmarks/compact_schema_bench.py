@@ -0,0 +1,134 @@
+"""Storage size and aggregate speed of the float/string and compact schemas
+
+Seeds the same synthetic dataset twice, once with COMPACT_SCHEMA off (REAL
+money, string type/frequency/period/status) and once with it on (integer
+cents, small integer codes), then prints table and index sizes from SQLite's
+dbstat table and the p50 time of a few aggregate queries for each.
+
+Usage:
+    python -m benchmarks.compact_schema_bench --years 3 --transactions-per-day 20
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func
+from app import create_app
+from benchmarks.seed import DEFAULT_SCALE, seed_database
+from database import db
+
+USER_ID = 1
+
+TABLES = ['transaction', 'transaction_monthly_rollup', 'budget', 'goal', 'recurring_transaction']
+
+def table_sizes():
+    """{table: (table bytes, index bytes)} from the dbstat virtual table"""
+    index_tables = dict(db.session.execute(db.text(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'"
+    )).all())
+    sizes = {table: [0, 0] for table in TABLES}
+    for name, size in db.session.execute(db.text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")):
+        if name in sizes:
+            sizes[name][0] += size
+        elif index_tables.get(name) in sizes:
+            sizes[index_tables[name]][1] += size
+    return sizes
+
+def aggregate_scenarios():
+    """(name, callable) pairs of aggregates that read the transaction table directly"""
+    import models_standard as ms
+    from models import Transaction
+
+    year_ago = date.today() - relativedelta(years=1)
+
+    def totals_by_type():
+        return db.session.query(Transaction.type, func.sum(Transaction.amount)).filter(
+            Transaction.user_id == USER_ID
+        ).group_by(Transaction.type).all()
+
+    def monthly_totals():
+        return db.session.query(
+            func.strftime('%Y-%m', Transaction.date), Transaction.type, func.sum(Transaction.amount)
+        ).filter(
+            Transaction.user_id == USER_ID,
+            Transaction.date >= year_ago
+        ).group_by(func.strftime('%Y-%m', Transaction.date), Transaction.type).all()
+
+    def rebuild_rollup():
+        ms.MonthlyRollup.rebuild()
+        db.session.rollback()
+
+    return [
+        ('totals_by_type', totals_by_type),
+        ('monthly_totals_last_year', monthly_totals),
+        ('budget_statuses', lambda: ms.BudgetAnalytics.get_all_budget_statuses(USER_ID)),
+        ('daily_trends_12_months', lambda: ms.TransactionAnalytics.get_spending_trends(USER_ID, 12, 'daily')),
+        ('rollup_rebuild', rebuild_rollup)
+    ]
+
+def run(label, compact, scale, iterations):
+    workdir = tempfile.mkdtemp(prefix='budget_bench_')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        'REQUEST_LOG_MODE': 'off',
+        'COMPACT_SCHEMA': compact
+    })
+
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_database(**scale)
+            db.session.execute(db.text("VACUUM"))
+
+            sizes = table_sizes()
+            timings = {}
+            for name, func_ in aggregate_scenarios():
+                func_()
+                samples = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    func_()
+                    samples.append((time.perf_counter() - started) * 1000)
+                timings[name] = round(statistics.median(samples), 3)
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {'label': label, 'sizes': sizes, 'timings': timings}
+
+def print_report(baseline, compact):
+    print(f"\n{'table':<28}{'data KB':>20}{'index KB':>20}")
+    for table in TABLES:
+        before, after = baseline['sizes'][table], compact['sizes'][table]
+        print(f"{table:<28}{before[0] // 1024:>9} -> {after[0] // 1024:<8}{before[1] // 1024:>9} -> {after[1] // 1024:<8}")
+    total_before = sum(sum(size) for size in baseline['sizes'].values())
+    total_after = sum(sum(size) for size in compact['sizes'].values())
+    print(f"{'total':<28}{total_before // 1024:>9} -> {total_after // 1024:<8} "
+          f"({(1 - total_after / total_before) * 100:.1f}% smaller)")
+
+    print(f"\n{'aggregate (p50 ms)':<28}{'float/string':>14}{'compact':>10}{'speedup':>10}")
+    for name, before in baseline['timings'].items():
+        after = compact['timings'][name]
+        print(f"{name:<28}{before:>14}{after:>10}{before / after if after else 0:>9.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=DEFAULT_SCALE['users'])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--transactions-per-day', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    scale = dict(DEFAULT_SCALE, users=args.users, years=args.years, transactions_per_day=args.transactions_per_day)
+    baseline = run('float/string', False, scale, args.iterations)
+    compact = run('compact', True, scale, args.iterations)
+    print_report(baseline, compact)
+    return baseline, compact
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,369 @@
+"""Endpoint and analytics benchmark suite
+
+Seeds a scratch database with benchmarks/seed.py, then times every route in
+app/routes/* through the Flask test client and every models_standard
+analytics function. Results are written as JSON so runs on different commits
+can be diffed, and --compare fails when a benchmark regresses beyond the
+threshold.
+
+Usage:
+    python -m benchmarks.endpoint_bench --output bench.json
+    python -m benchmarks.endpoint_bench --years 3 --transactions-per-day 20 --compare bench.json --threshold 0.2
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from benchmarks.seed import DEFAULT_SCALE, BENCHMARK_PASSWORD, seed_database
+
+USER_ID = 1  # routes currently act as the default test user
+
+_counter = itertools.count()
+
+def _unique(prefix):
+    return f"{prefix} {next(_counter)}"
+
+def _budget_payload(ctx):
+    # A distinct start date per call so the duplicate-budget check never rejects it
+    year = 2000 + next(_counter) % 500
+    return {'category_id': ctx['leaf_category_id'], 'amount_limit': 500, 'period': 'monthly',
+            'start_date': f"{year:04d}-01-01", 'end_date': f"{year:04d}-12-31"}
+
+def _leaf_category_id(ctx):
+    return ctx['leaf_category_id']
+
+def _new_category(ctx):
+    """Create a throwaway category outside the timed section and return its id"""
+    from database import db
+    from models import Category
+    from models_standard import CategoryManager
+
+    category = Category(name=_unique('Bench temp'), parent_id=None)
+    db.session.add(category)
+    db.session.flush()
+    CategoryManager.add_category_to_closure(category.id, None)
+    db.session.commit()
+    return {'category_id': category.id}
+
+class Form(dict):
+    """Scenario body sent as multipart/form-data instead of JSON"""
+
+def _statement_upload(ctx):
+    lines = ['date,amount,description']
+    lines += [f"{date.today().isoformat()},-{i % 200 + 1}.25,Bench statement row" for i in range(1000)]
+    return Form(file=(io.BytesIO('\n'.join(lines).encode()), 'statement.csv'))
+
+# (name, method, path, json body, per-iteration setup); path and body may be callables of the context
+ROUTE_SCENARIOS = [
+    ('home', 'GET', '/', None, None),
+    ('health', 'GET', '/api/health/', None, None),
+    ('metrics', 'GET', '/metrics', None, None),
+    ('auth.register', 'POST', '/api/auth/register',
+     lambda ctx: {'email': f"bench{next(_counter)}@bench.local", 'password': 'benchmark123'}, None),
+    ('auth.login', 'POST', '/api/auth/login',
+     lambda ctx: {'email': f"user{USER_ID}@bench.local", 'password': BENCHMARK_PASSWORD}, None),
+    ('auth.refresh', 'POST', '/api/auth/refresh', None, None),
+    ('auth.me', 'GET', '/api/auth/me', None, None),
+    ('users.get_profile', 'GET', '/api/users/profile', None, None),
+    ('users.update_profile', 'PUT', '/api/users/profile', lambda ctx: {'first_name': _unique('Bench')}, None),
+    # Rejection paths only, so the benchmark user keeps its password and account
+    ('users.change_password', 'PUT', '/api/users/change-password',
+     lambda ctx: {'current_password': 'wrong-password', 'new_password': 'benchmark456'}, None),
+    ('users.delete_account', 'DELETE', '/api/users/delete-account', lambda ctx: {'password': 'wrong-password'}, None),
+    ('categories.get_categories', 'GET', '/api/categories/', None, None),
+    ('categories.get_categories_flat', 'GET', '/api/categories/flat', None, None),
+    ('categories.create_category', 'POST', '/api/categories/', lambda ctx: {'name': _unique('Bench category')}, None),
+    ('categories.update_category', 'PUT', lambda ctx: f"/api/categories/{ctx['category_id']}",
+     lambda ctx: {'name': _unique('Bench renamed')}, _new_category),
+    ('categories.delete_category', 'DELETE', lambda ctx: f"/api/categories/{ctx['category_id']}", None, _new_category),
+    ('transactions.get_transactions', 'GET', '/api/transactions/?page=1&per_page=20', None, None),
+    ('transactions.get_transactions_deep_page', 'GET', '/api/transactions/?page=200&per_page=20', None, None),
+    ('transactions.get_transactions_cursor', 'GET', '/api/transactions/?cursor=&per_page=20', None, None),
+    ('transactions.export_csv', 'GET', '/api/transactions/export?format=csv', None, None),
+    ('transactions.export_ndjson', 'GET', '/api/transactions/export?format=ndjson', None, None),
+    ('transactions.create_transaction', 'POST', '/api/transactions/',
+     lambda ctx: {'amount': 12.5, 'type': 'expense', 'category_id': _leaf_category_id(ctx), 'note': 'bench'}, None),
+    ('transactions.create_transactions_bulk', 'POST', '/api/transactions/bulk',
+     lambda ctx: {'transactions': [{'amount': 12.5, 'type': 'expense', 'category_id': _leaf_category_id(ctx)}] * 500}, None),
+    ('transactions.import_transactions', 'POST', '/api/transactions/import', _statement_upload, None),
+    ('budgets.get_budgets', 'GET', '/api/budgets/', None, None),
+    ('budgets.get_budgets_status', 'GET', '/api/budgets/status', None, None),
+    ('budgets.create_budget', 'POST', '/api/budgets/', _budget_payload, None),
+    ('goals.get_goals', 'GET', '/api/goals/', None, None),
+    ('goals.create_goal', 'POST', '/api/goals/', lambda ctx: {'title': _unique('Bench goal'), 'target_amount': 1000}, None),
+    ('goals.contribute_to_goals', 'POST', '/api/goals/contributions',
+     lambda ctx: {'contributions': [{'goal_id': ctx['goal_id'], 'amount': 0.01}] * 100}, None),
+    ('recurring.get_recurring_transactions', 'GET', '/api/recurring-transactions/', None, None),
+    ('recurring.create_recurring_transaction', 'POST', '/api/recurring-transactions/',
+     lambda ctx: {'category_id': _leaf_category_id(ctx), 'amount': 50, 'type': 'expense',
+                  'frequency': 'monthly', 'next_due_date': date.today().isoformat()}, None),
+    ('recurring.update_recurring_transaction', 'PUT', lambda ctx: f"/api/recurring-transactions/{ctx['recurring_id']}",
+     lambda ctx: {'description': _unique('Bench recurring')}, None),
+    ('forecast.get_forecast', 'GET', '/api/forecast?months=60', None, None),
+    # Profiling is off in the benchmark app, so these only time the disabled (404) path
+    ('profiles.list_request_profiles', 'GET', '/api/admin/profiles', None, None),
+    ('profiles.get_request_profile', 'GET', '/api/admin/profiles/missing.prof', None, None),
+]
+
+def analytics_scenarios():
+    """(name, callable) pairs for every models_standard analytics function"""
+    import models_standard as ms
+
+    today = date.today()
+    year_start = today.replace(month=1, day=1)
+
+    return [
+        ('BudgetAnalytics.calculate_budget_usage',
+         lambda ctx: ms.BudgetAnalytics.calculate_budget_usage(USER_ID, ctx['leaf_category_id'], year_start, today)),
+        ('BudgetAnalytics.get_budget_status',
+         lambda ctx: ms.BudgetAnalytics.get_budget_status(USER_ID, ctx['budget_id'])),
+        ('BudgetAnalytics.get_all_budget_statuses',
+         lambda ctx: ms.BudgetAnalytics.get_all_budget_statuses(USER_ID)),
+        ('GoalCalculations.calculate_goal_progress',
+         lambda ctx: ms.GoalCalculations.calculate_goal_progress(ctx['goal_id'])),
+        ('RecurringTransactionProcessor.get_due_recurring_transactions',
+         lambda ctx: ms.RecurringTransactionProcessor.get_due_recurring_transactions(USER_ID)),
+        ('RecurringTransactionProcessor.calculate_next_due_date',
+         lambda ctx: ms.RecurringTransactionProcessor.calculate_next_due_date(today, 'monthly')),
+        ('TransactionAnalytics.get_monthly_summary',
+         lambda ctx: ms.TransactionAnalytics.get_monthly_summary(USER_ID, today.year, today.month)),
+        ('TransactionAnalytics.get_spending_trends',
+         lambda ctx: ms.TransactionAnalytics.get_spending_trends(USER_ID, 12)),
+        ('TransactionAnalytics.get_spending_trends_daily',
+         lambda ctx: ms.TransactionAnalytics.get_spending_trends(USER_ID, 12, 'daily')),
+        ('CashFlowForecast.forecast',
+         lambda ctx: ms.CashFlowForecast.forecast(USER_ID, 60)),
+        ('CategoryManager.get_category_tree_with_totals',
+         lambda ctx: ms.CategoryManager.get_category_tree_with_totals(USER_ID)),
+    ]
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+    return {
+        'iterations': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[p95_index], 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3)
+    }
+
+def _resolve(value, ctx):
+    return value(ctx) if callable(value) else value
+
+def time_routes(app, ctx, iterations, warmup):
+    from database import db
+
+    client = app.test_client()
+    results = {}
+    for name, method, path, body, setup in ROUTE_SCENARIOS:
+        samples = []
+        statuses = set()
+        queries = 0
+        for i in range(warmup + iterations):
+            with app.app_context():
+                run_ctx = dict(ctx, **(setup(ctx) if setup else {}))
+                db.session.remove()
+
+            url = _resolve(path, run_ctx)
+            payload = _resolve(body, run_ctx)
+
+            if isinstance(payload, Form):
+                request_kwargs = {'data': dict(payload), 'content_type': 'multipart/form-data'}
+            else:
+                request_kwargs = {'json': payload}
+
+            started = time.perf_counter()
+            response = client.open(url, method=method, **request_kwargs)
+            # Streamed bodies (exports) are only produced while they are read
+            response.get_data()
+            elapsed = (time.perf_counter() - started) * 1000
+            response.close()
+
+            if i >= warmup:
+                samples.append(elapsed)
+                statuses.add(response.status_code)
+                queries = max(queries, int(response.headers.get('X-DB-Queries', 0)))
+
+        results[name] = dict(summarize(samples), statuses=sorted(statuses), queries=queries)
+    return results
+
+def time_analytics(app, ctx, iterations, warmup):
+    from database import db
+
+    results = {}
+    for name, func in analytics_scenarios():
+        samples = []
+        with app.app_context():
+            for i in range(warmup + iterations):
+                started = time.perf_counter()
+                func(ctx)
+                elapsed = (time.perf_counter() - started) * 1000
+                if i >= warmup:
+                    samples.append(elapsed)
+            db.session.remove()
+        results[name] = summarize(samples)
+    return results
+
+def uncovered_routes(app):
+    """Routes registered on the app that have no scenario (so new routes are not silently skipped)"""
+    covered_endpoints = set()
+    adapter = app.url_map.bind('localhost')
+    for _, method, path, _, _ in ROUTE_SCENARIOS:
+        sample_path = path({'category_id': 1, 'leaf_category_id': 1, 'recurring_id': 1}) if callable(path) else path
+        try:
+            endpoint, _ = adapter.match(sample_path.split('?')[0], method=method)
+            covered_endpoints.add((endpoint, method))
+        except Exception:
+            pass
+
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint == 'static' or rule.endpoint.startswith('flasgger'):
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (rule.endpoint, method) not in covered_endpoints:
+                missing.append(f"{method} {rule.rule}")
+    return sorted(missing)
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+def run(scale, iterations=20, warmup=3, database_path=None):
+    """Seed a scratch database, run every benchmark and return the results document"""
+    from app import create_app
+    from database import db
+    from models import Budget, Goal, RecurringTransaction, Transaction
+
+    workdir = None
+    if database_path is None:
+        workdir = tempfile.mkdtemp(prefix='budget_bench_')
+        database_path = os.path.join(workdir, 'bench.db')
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.abspath(database_path)}",
+        'REQUEST_LOG_MODE': 'off',
+        'QUERY_STATS_HEADERS': True
+    })
+
+    try:
+        with app.app_context():
+            db.create_all()
+            seeded_at = time.perf_counter()
+            seeded = seed_database(**scale)
+            seed_seconds = time.perf_counter() - seeded_at
+
+            ctx = {
+                'leaf_category_id': db.session.query(Transaction.category_id).filter(
+                    Transaction.category_id.isnot(None)).first()[0],
+                'budget_id': db.session.query(Budget.id).filter_by(user_id=USER_ID).first()[0],
+                'goal_id': db.session.query(Goal.id).filter_by(user_id=USER_ID).first()[0],
+                'recurring_id': db.session.query(RecurringTransaction.id).filter_by(user_id=USER_ID).first()[0]
+            }
+
+        return {
+            'meta': {
+                'revision': git_revision(),
+                'timestamp': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': iterations,
+                'warmup': warmup,
+                'seed_seconds': round(seed_seconds, 2),
+                'dataset': seeded
+            },
+            'routes': time_routes(app, ctx, iterations, warmup),
+            'analytics': time_analytics(app, ctx, iterations, warmup),
+            'uncovered_routes': uncovered_routes(app)
+        }
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def compare(baseline, current, threshold, min_delta_ms=1.0, metric='p50_ms'):
+    """Return a list of (name, baseline ms, current ms, ratio) that got slower than allowed
+    
+    Slowdowns smaller than min_delta_ms are ignored, so sub-millisecond noise
+    on trivial routes does not fail the check.
+    """
+    regressions = []
+    for section in ('routes', 'analytics'):
+        for name, result in current.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous or not previous.get(metric):
+                continue
+            ratio = result[metric] / previous[metric]
+            if ratio > 1 + threshold and result[metric] - previous[metric] >= min_delta_ms:
+                regressions.append((f"{section}:{name}", previous[metric], result[metric], round(ratio, 2)))
+    return regressions
+
+def print_report(results):
+    for section in ('routes', 'analytics'):
+        print(f"\n{section.upper()}")
+        for name, result in results[section].items():
+            statuses = f"  {result['statuses']}" if 'statuses' in result else ''
+            queries = f"  {result['queries']:>3} queries" if 'queries' in result else ''
+            print(f"  {name:<60} p50 {result['p50_ms']:>9.3f} ms   p95 {result['p95_ms']:>9.3f} ms{queries}{statuses}")
+    if results['uncovered_routes']:
+        print("\nRoutes without a benchmark scenario:")
+        for route in results['uncovered_routes']:
+            print(f"  {route}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark API routes and analytics functions')
+    parser.add_argument('--users', type=int, default=DEFAULT_SCALE['users'])
+    parser.add_argument('--years', type=int, default=DEFAULT_SCALE['years'])
+    parser.add_argument('--transactions-per-day', type=int, default=DEFAULT_SCALE['transactions_per_day'])
+    parser.add_argument('--category-roots', type=int, default=DEFAULT_SCALE['category_roots'])
+    parser.add_argument('--category-depth', type=int, default=DEFAULT_SCALE['category_depth'])
+    parser.add_argument('--category-fanout', type=int, default=DEFAULT_SCALE['category_fanout'])
+    parser.add_argument('--budgets-per-user', type=int, default=DEFAULT_SCALE['budgets_per_user'])
+    parser.add_argument('--goals-per-user', type=int, default=DEFAULT_SCALE['goals_per_user'])
+    parser.add_argument('--recurring-per-user', type=int, default=DEFAULT_SCALE['recurring_per_user'])
+    parser.add_argument('--seed', type=int, default=DEFAULT_SCALE['seed'])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='baseline results JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown ratio (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore slowdowns smaller than this')
+    args = parser.parse_args(argv)
+
+    scale = {key: getattr(args, key) for key in DEFAULT_SCALE}
+    results = run(scale, args.iterations, args.warmup)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for name, before, after, ratio in regressions:
+                print(f"  {name}: {before} ms -> {after} ms ({ratio}x)")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
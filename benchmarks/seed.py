@@ -0,0 +1,168 @@
+"""Synthetic data generator for benchmarks
+
+Fills a database with users, a category tree, transactions, budgets, goals
+and recurring rules at a configurable scale. Generation is deterministic for
+a given seed, so runs on different commits see the same data.
+"""
+import random
+from datetime import date, datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from database import db
+
+DEFAULT_SCALE = {
+    'users': 3,
+    'years': 1,
+    'transactions_per_day': 5,
+    'category_roots': 11,
+    'category_depth': 2,  # levels below each root
+    'category_fanout': 3,  # children per category
+    'budgets_per_user': 5,
+    'goals_per_user': 3,
+    'recurring_per_user': 5,
+    'seed': 42
+}
+
+BENCHMARK_PASSWORD = 'benchmark123'
+
+CHUNK_SIZE = 10000
+
+def _insert_chunked(model, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+def seed_categories(roots, depth, fanout):
+    """Create a category forest and return (leaf ids, total number of categories)"""
+    from models import Category
+
+    rows = []
+    next_id = 1
+    level = []
+    for _ in range(roots):
+        rows.append({'id': next_id, 'name': f"Category {next_id}", 'parent_id': None})
+        level.append(next_id)
+        next_id += 1
+
+    leaves = list(level)
+    for _ in range(depth):
+        next_level = []
+        for parent_id in level:
+            for _ in range(fanout):
+                rows.append({'id': next_id, 'name': f"Category {next_id}", 'parent_id': parent_id})
+                next_level.append(next_id)
+                next_id += 1
+        if next_level:
+            leaves = next_level
+        level = next_level
+
+    _insert_chunked(Category, rows)
+    return leaves, len(rows)
+
+def seed_database(**overrides):
+    """Populate the current app's database and return a summary of what was created"""
+    from models import User, Transaction, Budget, Goal, RecurringTransaction
+    from models_standard import CategoryManager, MonthlyRollup
+
+    scale = dict(DEFAULT_SCALE, **overrides)
+    rnd = random.Random(scale['seed'])
+    today = date.today()
+
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD)
+    user_ids = list(range(1, scale['users'] + 1))
+    _insert_chunked(User, [
+        {
+            'id': user_id,
+            'email': f"user{user_id}@bench.local",
+            'password_hash': password_hash,
+            'first_name': 'Bench',
+            'last_name': f"User {user_id}",
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+        for user_id in user_ids
+    ])
+
+    leaves, category_count = seed_categories(scale['category_roots'], scale['category_depth'], scale['category_fanout'])
+
+    # Transactions: a fixed number per day for every user, over the whole window
+    start_date = today - relativedelta(years=scale['years'])
+    days = (today - start_date).days + 1
+    transaction_count = 0
+    for user_id in user_ids:
+        rows = []
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            for _ in range(scale['transactions_per_day']):
+                is_income = rnd.random() < 0.1
+                rows.append({
+                    'user_id': user_id,
+                    'amount': round(rnd.uniform(500, 5000) if is_income else rnd.uniform(1, 300), 2),
+                    'type': 'income' if is_income else 'expense',
+                    'category_id': rnd.choice(leaves) if rnd.random() > 0.02 else None,
+                    'date': day,
+                    'note': 'Synthetic transaction',
+                    'created_at': datetime.combine(day, datetime.min.time()) + timedelta(seconds=rnd.randint(0, 86399))
+                })
+        _insert_chunked(Transaction, rows)
+        transaction_count += len(rows)
+
+    month_start = today.replace(day=1)
+    month_end = month_start + relativedelta(months=1) - timedelta(days=1)
+    budget_rows = []
+    goal_rows = []
+    recurring_rows = []
+    for user_id in user_ids:
+        for category_id in rnd.sample(leaves, min(scale['budgets_per_user'], len(leaves))):
+            budget_rows.append({
+                'user_id': user_id,
+                'category_id': category_id,
+                'amount_limit': round(rnd.uniform(100, 1000), 2),
+                'period': 'monthly',
+                'start_date': month_start,
+                'end_date': month_end,
+                'created_at': datetime.utcnow()
+            })
+
+        for i in range(scale['goals_per_user']):
+            target = round(rnd.uniform(1000, 20000), 2)
+            goal_rows.append({
+                'user_id': user_id,
+                'title': f"Goal {i + 1}",
+                'target_amount': target,
+                'current_amount': round(target * rnd.random(), 2),
+                'target_date': today + timedelta(days=rnd.randint(30, 720)),
+                'status': 'active',
+                'created_at': datetime.utcnow()
+            })
+
+        for i in range(scale['recurring_per_user']):
+            recurring_rows.append({
+                'user_id': user_id,
+                'category_id': rnd.choice(leaves),
+                'amount': round(rnd.uniform(10, 2000), 2),
+                'type': rnd.choice(['income', 'expense']),
+                'frequency': rnd.choice(['daily', 'weekly', 'monthly', 'yearly']),
+                'next_due_date': today + timedelta(days=rnd.randint(-10, 60)),
+                'is_active': True,
+                'description': f"Recurring {i + 1}",
+                'created_at': datetime.utcnow()
+            })
+
+    _insert_chunked(Budget, budget_rows)
+    _insert_chunked(Goal, goal_rows)
+    _insert_chunked(RecurringTransaction, recurring_rows)
+
+    CategoryManager.rebuild_closure()
+    MonthlyRollup.rebuild()
+    db.session.commit()
+
+    return {
+        'scale': scale,
+        'users': len(user_ids),
+        'categories': category_count,
+        'transactions': transaction_count,
+        'budgets': len(budget_rows),
+        'goals': len(goal_rows),
+        'recurring_transactions': len(recurring_rows)
+    }
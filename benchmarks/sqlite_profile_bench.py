@@ -0,0 +1,149 @@
+"""Mixed read/write throughput with and without the SQLite profile
+
+Runs reader and writer threads against a scratch database shaped like the
+transaction table, once with SQLite defaults and once with the profile from
+app/config.py, and prints operations per second and lock errors for each.
+
+Usage:
+    python -m benchmarks.sqlite_profile_bench --seconds 5 --readers 4 --writers 2
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.config import Config
+from app.sqlite_profile import attach_sqlite_profile
+
+SCHEMA = '''
+CREATE TABLE "transaction" (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    amount FLOAT NOT NULL,
+    type VARCHAR(10) NOT NULL,
+    category_id INTEGER,
+    date DATE,
+    note VARCHAR(200),
+    created_at DATETIME
+)
+'''
+
+def make_engine(path, profile):
+    engine = create_engine(f"sqlite:///{path}", connect_args={'check_same_thread': False})
+    if profile:
+        attach_sqlite_profile(engine, profile)
+    return engine
+
+def seed(engine, rows, users):
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text('CREATE INDEX idx_transaction_user_date ON "transaction"(user_id, date)'))
+        start = date.today() - timedelta(days=730)
+        conn.execute(text(
+            'INSERT INTO "transaction" (user_id, amount, type, category_id, date, note) '
+            'VALUES (:user_id, :amount, :type, :category_id, :date, :note)'
+        ), [
+            {
+                'user_id': random.randint(1, users),
+                'amount': round(random.uniform(1, 500), 2),
+                'type': random.choice(['income', 'expense']),
+                'category_id': random.randint(1, 11),
+                'date': (start + timedelta(days=random.randint(0, 730))).isoformat(),
+                'note': 'seed'
+            }
+            for _ in range(rows)
+        ])
+
+def reader(engine, users, stop, stats):
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(
+                    'SELECT type, SUM(amount), COUNT(*) FROM "transaction" '
+                    'WHERE user_id = :user_id AND date >= :start GROUP BY type'
+                ), {'user_id': random.randint(1, users), 'start': (date.today() - timedelta(days=90)).isoformat()}).all()
+            stats['reads'] += 1
+        except OperationalError:
+            stats['errors'] += 1
+
+def writer(engine, users, stop, stats):
+    while not stop.is_set():
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    'INSERT INTO "transaction" (user_id, amount, type, category_id, date, note) '
+                    'VALUES (:user_id, :amount, :type, :category_id, :date, :note)'
+                ), {
+                    'user_id': random.randint(1, users),
+                    'amount': round(random.uniform(1, 500), 2),
+                    'type': 'expense',
+                    'category_id': random.randint(1, 11),
+                    'date': date.today().isoformat(),
+                    'note': 'bench'
+                })
+            stats['writes'] += 1
+        except OperationalError:
+            stats['errors'] += 1
+
+def run(label, profile, args):
+    workdir = tempfile.mkdtemp(prefix='budget_bench_')
+    path = os.path.join(workdir, 'bench.db')
+    engine = make_engine(path, profile)
+    seed(engine, args.rows, args.users)
+
+    stop = threading.Event()
+    thread_stats = []
+    threads = []
+    for target, count in [(reader, args.readers), (writer, args.writers)]:
+        for _ in range(count):
+            stats = {'reads': 0, 'writes': 0, 'errors': 0}
+            thread_stats.append(stats)
+            threads.append(threading.Thread(target=target, args=(engine, args.users, stop, stats)))
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    reads = sum(s['reads'] for s in thread_stats)
+    writes = sum(s['writes'] for s in thread_stats)
+    errors = sum(s['errors'] for s in thread_stats)
+    result = {
+        'profile': label,
+        'reads_per_sec': round(reads / elapsed, 1),
+        'writes_per_sec': round(writes / elapsed, 1),
+        'ops_per_sec': round((reads + writes) / elapsed, 1),
+        'lock_errors': errors
+    }
+    print(f"{label:>8}: {result['ops_per_sec']:>9} ops/s  "
+          f"({result['reads_per_sec']} reads/s, {result['writes_per_sec']} writes/s, {errors} lock errors)")
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    baseline = run('default', None, args)
+    tuned = run('profile', Config.SQLITE_PROFILE, args)
+    if baseline['ops_per_sec']:
+        print(f"speedup: {tuned['ops_per_sec'] / baseline['ops_per_sec']:.2f}x")
+    return baseline, tuned
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+from sqlalchemy.types import TypeDecorator, Float, Integer, SmallInteger, String
+
+# Money is stored as integer minor units (cents) in compact mode
+MINOR_UNITS = 100
+
+TRANSACTION_TYPES = ('income', 'expense')
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+BUDGET_PERIODS = ('monthly', 'yearly')
+GOAL_STATUSES = ('active', 'completed', 'paused')
+
+# The layout belongs to a database, so it is kept on the dialect of the engine bound to it
+# (set by app.compact_schema.init_app() before the engine is used). Dialects without it
+# use the float/string layout.
+
+def set_compact_schema(dialect, enabled):
+    dialect.compact_schema = bool(enabled)
+
+def compact_schema_enabled(dialect):
+    return getattr(dialect, 'compact_schema', False)
+
+def money_to_db(value, dialect):
+    """Convert an amount to its stored form (minor units in compact mode)"""
+    if value is None or not compact_schema_enabled(dialect):
+        return value
+    return int(round(float(value) * MINOR_UNITS))
+
+class Money(TypeDecorator):
+    """Amount of money: a float in Python, REAL or integer minor units in the database"""
+
+    impl = Float
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(Integer() if compact_schema_enabled(dialect) else Float())
+
+    def process_bind_param(self, value, dialect):
+        return money_to_db(value, dialect)
+
+    def process_result_value(self, value, dialect):
+        if value is None or not compact_schema_enabled(dialect):
+            return value
+        return value / MINOR_UNITS
+
+class Code(TypeDecorator):
+    """One of a fixed set of names: a string in Python, the name or a small integer code in the database
+
+    Codes are 1-based positions in `names`, so new names may only be appended.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, names, length):
+        super().__init__(length)
+        self.names = tuple(names)
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(SmallInteger() if compact_schema_enabled(dialect) else String(self.impl.length))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not compact_schema_enabled(dialect):
+            return value
+        try:
+            return self.names.index(value) + 1
+        except ValueError:
+            raise ValueError(f"{value!r} is not one of {', '.join(self.names)}")
+
+    def process_result_value(self, value, dialect):
+        if value is None or not compact_schema_enabled(dialect) or isinstance(value, str):
+            return value
+        return self.names[value - 1]
@@ -0,0 +1,7 @@
+-- Migration: Add Keyset Pagination Index on Transactions
+-- Created: 2026-10-17
+
+-- Matches the (date, created_at, id) sort key used by cursor pagination,
+-- so every page is an index range scan regardless of how deep it is
+CREATE INDEX IF NOT EXISTS idx_transaction_user_date_created
+ON "transaction"(user_id, date, created_at, id);
@@ -0,0 +1,26 @@
+-- Migration: Create Category Closure Table
+-- Created: 2026-10-17
+
+-- One row per (ancestor, descendant) pair, including each category with itself (depth 0).
+-- Lets category trees of any depth be rolled up with a single join.
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id),
+    FOREIGN KEY (ancestor_id) REFERENCES category(id) ON DELETE CASCADE,
+    FOREIGN KEY (descendant_id) REFERENCES category(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_category_closure_descendant_id ON category_closure(descendant_id);
+
+-- Backfill from existing parent_id links
+WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM category
+    UNION ALL
+    SELECT tree.ancestor_id, category.id, tree.depth + 1
+    FROM tree JOIN category ON category.parent_id = tree.descendant_id
+    WHERE tree.depth < 64
+)
+INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, depth FROM tree;
@@ -0,0 +1,23 @@
+-- Migration: Create Transaction Monthly Rollup Table
+-- Created: 2026-10-17
+
+-- Sum and count of transactions per (user, month, category, type). Maintained by the
+-- transaction write paths so monthly summaries, trends and category totals scale with
+-- the number of months instead of the number of transactions.
+-- category_id is 0 for uncategorized transactions so it can be part of the primary key.
+CREATE TABLE IF NOT EXISTS transaction_monthly_rollup (
+    user_id INTEGER NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    category_id INTEGER NOT NULL,
+    type VARCHAR(10) NOT NULL,
+    total FLOAT NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, category_id, type)
+);
+
+-- Backfill from existing transactions (only into an empty table, so re-running is a no-op)
+INSERT INTO transaction_monthly_rollup (user_id, month, category_id, type, total, count)
+SELECT user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type, SUM(amount), COUNT(*)
+FROM "transaction"
+WHERE NOT EXISTS (SELECT 1 FROM transaction_monthly_rollup)
+GROUP BY user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type;
@@ -0,0 +1,12 @@
+-- Migration: Create Change Version Table
+-- Created: 2026-10-17
+
+-- One counter per (user, table), bumped in the same transaction as every write to that
+-- table. List endpoints derive their ETag from it, so a conditional GET costs one
+-- primary key lookup. Global tables (category) use user_id 0.
+CREATE TABLE IF NOT EXISTS change_version (
+    user_id INTEGER NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, table_name)
+);
@@ -0,0 +1,213 @@
+-- Migration: Store Money as Integer Cents and Enumerations as Small Integer Codes
+-- Created: 2026-10-17
+
+-- amount / amount_limit / target_amount / current_amount / total become INTEGER cents
+-- (exact sums, 1-8 byte integers instead of 8 byte floats). type, frequency, period and
+-- status become SMALLINT codes, which are the 1-based positions of the names in
+-- column_types.py:
+--   type:      1 income, 2 expense
+--   frequency: 1 daily, 2 weekly, 3 monthly, 4 yearly
+--   period:    1 monthly, 2 yearly
+--   status:    1 active, 2 completed, 3 paused
+-- SQLite cannot change column types, so each table is rebuilt and copied. Only REAL
+-- values are scaled and only names are mapped, so running this again is harmless.
+-- The app detects the new layout from transaction.amount at startup.
+
+-- Views read the old columns; they are recreated at the end
+DROP VIEW IF EXISTS goal_progress;
+DROP VIEW IF EXISTS due_recurring_transactions;
+
+-- Transactions
+DROP TABLE IF EXISTS transaction_compact;
+CREATE TABLE transaction_compact (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    type SMALLINT NOT NULL CHECK (type IN (1, 2)),
+    category_id INTEGER,
+    date DATE DEFAULT (DATE('now')),
+    note VARCHAR(200),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES category(id) ON DELETE SET NULL
+);
+
+INSERT INTO transaction_compact (id, user_id, amount, type, category_id, date, note, created_at)
+SELECT
+    id,
+    user_id,
+    CASE WHEN typeof(amount) = 'real' THEN CAST(ROUND(amount * 100) AS INTEGER) ELSE amount END,
+    CASE type WHEN 'income' THEN 1 WHEN 'expense' THEN 2 ELSE type END,
+    category_id,
+    date,
+    note,
+    created_at
+FROM "transaction";
+
+DROP TABLE "transaction";
+ALTER TABLE transaction_compact RENAME TO "transaction";
+
+CREATE INDEX IF NOT EXISTS idx_transaction_user ON "transaction"(user_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_category ON "transaction"(category_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_date ON "transaction"(date);
+CREATE INDEX IF NOT EXISTS idx_transaction_type ON "transaction"(type);
+CREATE INDEX IF NOT EXISTS idx_transaction_user_date_created
+ON "transaction"(user_id, date, created_at, id);
+
+-- Monthly rollup (derived data, so it is rebuilt from the converted transactions)
+DROP TABLE IF EXISTS transaction_monthly_rollup;
+CREATE TABLE transaction_monthly_rollup (
+    user_id INTEGER NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    category_id INTEGER NOT NULL,
+    type SMALLINT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, month, category_id, type)
+);
+
+INSERT INTO transaction_monthly_rollup (user_id, month, category_id, type, total, count)
+SELECT user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type, SUM(amount), COUNT(*)
+FROM "transaction"
+GROUP BY user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type;
+
+-- Budgets
+DROP TABLE IF EXISTS budget_compact;
+CREATE TABLE budget_compact (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount_limit INTEGER NOT NULL CHECK (amount_limit > 0),
+    period SMALLINT NOT NULL CHECK (period IN (1, 2)),
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES category(id) ON DELETE CASCADE,
+    CHECK (end_date > start_date)
+);
+
+INSERT INTO budget_compact (id, user_id, category_id, amount_limit, period, start_date, end_date, created_at)
+SELECT
+    id,
+    user_id,
+    category_id,
+    CASE WHEN typeof(amount_limit) = 'real' THEN CAST(ROUND(amount_limit * 100) AS INTEGER) ELSE amount_limit END,
+    CASE period WHEN 'monthly' THEN 1 WHEN 'yearly' THEN 2 ELSE period END,
+    start_date,
+    end_date,
+    created_at
+FROM budget;
+
+DROP TABLE budget;
+ALTER TABLE budget_compact RENAME TO budget;
+
+CREATE INDEX IF NOT EXISTS idx_budget_user ON budget(user_id);
+CREATE INDEX IF NOT EXISTS idx_budget_category ON budget(category_id);
+CREATE INDEX IF NOT EXISTS idx_budget_period ON budget(period);
+CREATE INDEX IF NOT EXISTS idx_budget_dates ON budget(start_date, end_date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_budget_unique
+ON budget(user_id, category_id, period, start_date);
+
+-- Goals
+DROP TABLE IF EXISTS goal_compact;
+CREATE TABLE goal_compact (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    title VARCHAR(100) NOT NULL,
+    target_amount INTEGER NOT NULL CHECK (target_amount > 0),
+    current_amount INTEGER DEFAULT 0 CHECK (current_amount >= 0),
+    target_date DATE,
+    status SMALLINT DEFAULT 1 CHECK (status IN (1, 2, 3)),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
+    CHECK (current_amount <= target_amount)
+);
+
+INSERT INTO goal_compact (id, user_id, title, target_amount, current_amount, target_date, status, created_at)
+SELECT
+    id,
+    user_id,
+    title,
+    CASE WHEN typeof(target_amount) = 'real' THEN CAST(ROUND(target_amount * 100) AS INTEGER) ELSE target_amount END,
+    CASE WHEN typeof(current_amount) = 'real' THEN CAST(ROUND(current_amount * 100) AS INTEGER) ELSE current_amount END,
+    target_date,
+    CASE status WHEN 'active' THEN 1 WHEN 'completed' THEN 2 WHEN 'paused' THEN 3 ELSE status END,
+    created_at
+FROM goal;
+
+DROP TABLE goal;
+ALTER TABLE goal_compact RENAME TO goal;
+
+CREATE INDEX IF NOT EXISTS idx_goal_user ON goal(user_id);
+CREATE INDEX IF NOT EXISTS idx_goal_status ON goal(status);
+CREATE INDEX IF NOT EXISTS idx_goal_target_date ON goal(target_date);
+
+-- Recurring transactions
+DROP TABLE IF EXISTS recurring_transaction_compact;
+CREATE TABLE recurring_transaction_compact (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    type SMALLINT NOT NULL CHECK (type IN (1, 2)),
+    frequency SMALLINT NOT NULL CHECK (frequency IN (1, 2, 3, 4)),
+    next_due_date DATE NOT NULL,
+    is_active BOOLEAN DEFAULT 1,
+    description VARCHAR(200),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES category(id) ON DELETE CASCADE
+);
+
+INSERT INTO recurring_transaction_compact (
+    id, user_id, category_id, amount, type, frequency, next_due_date, is_active, description, created_at
+)
+SELECT
+    id,
+    user_id,
+    category_id,
+    CASE WHEN typeof(amount) = 'real' THEN CAST(ROUND(amount * 100) AS INTEGER) ELSE amount END,
+    CASE type WHEN 'income' THEN 1 WHEN 'expense' THEN 2 ELSE type END,
+    CASE frequency WHEN 'daily' THEN 1 WHEN 'weekly' THEN 2 WHEN 'monthly' THEN 3 WHEN 'yearly' THEN 4 ELSE frequency END,
+    next_due_date,
+    is_active,
+    description,
+    created_at
+FROM recurring_transaction;
+
+DROP TABLE recurring_transaction;
+ALTER TABLE recurring_transaction_compact RENAME TO recurring_transaction;
+
+CREATE INDEX IF NOT EXISTS idx_recurring_user ON recurring_transaction(user_id);
+CREATE INDEX IF NOT EXISTS idx_recurring_category ON recurring_transaction(category_id);
+CREATE INDEX IF NOT EXISTS idx_recurring_due_date ON recurring_transaction(next_due_date);
+CREATE INDEX IF NOT EXISTS idx_recurring_active ON recurring_transaction(is_active);
+CREATE INDEX IF NOT EXISTS idx_recurring_frequency ON recurring_transaction(frequency);
+
+-- Views, with amounts and codes decoded as before
+CREATE VIEW goal_progress AS
+SELECT
+    id,
+    user_id,
+    title,
+    target_amount / 100.0 AS target_amount,
+    current_amount / 100.0 AS current_amount,
+    ROUND((current_amount * 100.0 / target_amount), 2) as progress_percentage,
+    target_date,
+    CASE status WHEN 1 THEN 'active' WHEN 2 THEN 'completed' WHEN 3 THEN 'paused' END AS status,
+    created_at
+FROM goal;
+
+CREATE VIEW due_recurring_transactions AS
+SELECT
+    id,
+    user_id,
+    category_id,
+    amount / 100.0 AS amount,
+    CASE type WHEN 1 THEN 'income' WHEN 2 THEN 'expense' END AS type,
+    CASE frequency WHEN 1 THEN 'daily' WHEN 2 THEN 'weekly' WHEN 3 THEN 'monthly' WHEN 4 THEN 'yearly' END AS frequency,
+    next_due_date,
+    description
+FROM recurring_transaction
+WHERE is_active = 1 AND next_due_date <= DATE('now');
@@ -0,0 +1,11 @@
+-- Migration: Add Anchor Day on Recurring Transactions
+-- Created: 2026-10-17
+
+-- Day of month the rule was set up for. next_due_date is clamped in short months
+-- (Jan 31 -> Feb 28), so monthly/yearly occurrences are computed from this day
+-- instead of from next_due_date's own day. Existing rules keep their current day.
+ALTER TABLE recurring_transaction ADD COLUMN anchor_day SMALLINT;
+
+UPDATE recurring_transaction
+SET anchor_day = CAST(strftime('%d', next_due_date) AS INTEGER)
+WHERE anchor_day IS NULL;
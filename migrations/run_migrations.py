@@ -1,55 +1,212 @@
+import argparse
+import hashlib
+import re
 import sqlite3
-import os
+import sys
+import time
 from pathlib import Path
 
-def run_migrations():
-    """Run all SQL migration files in order"""
-    
-    # Database path
-    db_path = Path(__file__).parent.parent / "instance" / "budget.db"
-    migrations_dir = Path(__file__).parent
-    
-    # Get all migration files in order
-    migration_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith('.sql')])
-    
-    if not migration_files:
+MIGRATIONS_DIR = Path(__file__).parent
+DEFAULT_DB_PATH = MIGRATIONS_DIR.parent / "instance" / "budget.db"
+MIGRATION_FILE = re.compile(r'^(\d+)_(.+)\.sql$')
+
+# Tables the database may have that models.py does not define
+UNMODELED_TABLES = {'schema_migrations', 'sqlite_sequence'}
+
+SCHEMA_MIGRATIONS = '''
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INTEGER
+)
+'''
+
+def discover_migrations(migrations_dir=MIGRATIONS_DIR):
+    """(version, file name, sha256 of the file) for every NNN_name.sql file, in version order"""
+    migrations = []
+    for path in migrations_dir.iterdir():
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            checksum = hashlib.sha256(path.read_bytes()).hexdigest()
+            migrations.append((match.group(1), path.name, checksum))
+    return sorted(migrations, key=lambda migration: int(migration[0]))
+
+def applied_migrations(conn, create=True):
+    """{version: (file name, checksum)} recorded in schema_migrations"""
+    if create:
+        conn.execute(SCHEMA_MIGRATIONS)
+    elif not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'").fetchone():
+        return {}
+    return {version: (name, checksum) for version, name, checksum in
+            conn.execute("SELECT version, name, checksum FROM schema_migrations")}
+
+def plan_migrations(conn, migrations, create=True):
+    """Split migrations into (pending, changed): not applied yet / edited after being applied"""
+    applied = applied_migrations(conn, create)
+    pending = []
+    changed = []
+    for version, name, checksum in migrations:
+        if version not in applied:
+            pending.append((version, name, checksum))
+        elif applied[version][1] != checksum:
+            changed.append((version, name, checksum))
+    return pending, changed
+
+def split_statements(sql):
+    """Split a migration script into complete SQL statements"""
+    statements = []
+    buffer = ''
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ''
+    return statements
+
+def apply_migration(conn, version, name, checksum):
+    """Run one migration and record it, all in a single transaction"""
+    sql = (MIGRATIONS_DIR / name).read_text()
+    started = time.perf_counter()
+    conn.execute("BEGIN")
+    try:
+        for statement in split_statements(sql):
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name, checksum, duration_ms) VALUES (?, ?, ?, ?)",
+            (version, name, checksum, int((time.perf_counter() - started) * 1000))
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return time.perf_counter() - started
+
+def _affinity(declared_type):
+    """SQLite column affinity of a declared type (https://www.sqlite.org/datatype3.html)"""
+    declared_type = (declared_type or '').upper()
+    if 'INT' in declared_type:
+        return 'INTEGER'
+    if any(name in declared_type for name in ('CHAR', 'CLOB', 'TEXT')):
+        return 'TEXT'
+    if 'BLOB' in declared_type or not declared_type:
+        return 'BLOB'
+    if any(name in declared_type for name in ('REAL', 'FLOA', 'DOUB')):
+        return 'REAL'
+    return 'NUMERIC'
+
+def detect_drift(conn):
+    """Differences between the database schema and the models in models.py, as messages"""
+    sys.path.insert(0, str(MIGRATIONS_DIR.parent))
+    from sqlalchemy.dialects import sqlite
+    from column_types import set_compact_schema
+    from database import db
+    import models  # noqa: F401 (registers the tables on db.metadata)
+
+    # Compare against the storage layout this database actually uses
+    dialect = sqlite.dialect()
+    amount = [column for column in conn.execute('PRAGMA table_info("transaction")') if column[1] == 'amount']
+    if amount:
+        set_compact_schema(dialect, amount[0][2].upper().startswith('INT'))
+
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    drift = []
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            drift.append(f"table {table.name} is missing")
+            continue
+
+        columns = {column[1]: column for column in conn.execute(f'PRAGMA table_info("{table.name}")')}
+        for column in table.columns:
+            if column.name not in columns:
+                drift.append(f"column {table.name}.{column.name} is missing")
+                continue
+            expected = column.type.compile(dialect=dialect)
+            actual = columns[column.name][2]
+            if _affinity(expected) != _affinity(actual):
+                drift.append(f"column {table.name}.{column.name} is {actual}, models.py expects {expected}")
+        for name in sorted(set(columns) - {column.name for column in table.columns}):
+            drift.append(f"column {table.name}.{name} is not in models.py")
+
+        for index in table.indexes:
+            if index.name not in indexes:
+                drift.append(f"index {index.name} on {table.name} is missing")
+
+    modeled = {table.name for table in db.metadata.sorted_tables}
+    for name in sorted(tables - modeled - UNMODELED_TABLES):
+        drift.append(f"table {name} is not in models.py")
+    return drift
+
+def run_migrations(db_path=DEFAULT_DB_PATH, dry_run=False, check_drift=True):
+    """Apply pending migrations (each in its own transaction), then compare the schema with models.py
+
+    Returns 0 on success, 1 if a migration failed or was edited after being applied.
+    """
+    migrations = discover_migrations()
+    if not migrations:
         print("❌ No migration files found!")
-        return
-    
-    print("🚀 Running Database Migrations...")
-    print("=" * 50)
-    
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+        return 1
+
+    if dry_run:
+        # Read-only, and without creating the file if it does not exist yet
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) if Path(db_path).exists() else sqlite3.connect(':memory:')
+    else:
+        # isolation_level=None: transactions are started and ended explicitly per migration
+        conn = sqlite3.connect(db_path, isolation_level=None)
     try:
-        for migration_file in migration_files:
-            print(f"📄 Running: {migration_file}")
-            
-            # Read migration file
-            with open(migrations_dir / migration_file, 'r') as f:
-                sql_content = f.read()
-            
-            # Execute SQL commands
-            cursor.executescript(sql_content)
-            print(f"✅ Completed: {migration_file}")
-        
-        # Commit all changes
-        conn.commit()
-        print("\n🎉 All migrations completed successfully!")
-        
-        # Show table count
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        print(f"📊 Total tables: {len(tables)}")
-        
-    except Exception as e:
-        print(f"❌ Migration failed: {e}")
-        conn.rollback()
-    
+        pending, changed = plan_migrations(conn, migrations, create=not dry_run)
+
+        if changed:
+            print("❌ Migrations edited after they were applied (add a new migration instead):")
+            for version, name, _ in changed:
+                print(f"   {name}")
+            return 1
+
+        if dry_run:
+            print(f"📋 Migration plan for {db_path}")
+            print("=" * 50)
+            for version, name, _ in pending:
+                print(f"📄 Pending: {name}")
+            if not pending:
+                print("✅ Database is up to date")
+        elif not pending:
+            print("✅ Database is up to date, no migrations to run")
+        else:
+            print("🚀 Running Database Migrations...")
+            print("=" * 50)
+            for version, name, checksum in pending:
+                print(f"📄 Running: {name}")
+                try:
+                    seconds = apply_migration(conn, version, name, checksum)
+                except Exception as e:
+                    print(f"❌ Migration failed: {name}: {e}")
+                    print("   It was rolled back; earlier migrations stay applied.")
+                    return 1
+                print(f"✅ Completed: {name} ({seconds * 1000:.0f} ms)")
+            print(f"\n🎉 {len(pending)} migration(s) applied successfully!")
+
+        if check_drift:
+            drift = detect_drift(conn)
+            if drift:
+                print(f"\n⚠️  Schema differs from models.py{' (before the pending migrations)' if dry_run and pending else ''}:")
+                for message in drift:
+                    print(f"   - {message}")
+            else:
+                print("\n🔍 Schema matches models.py")
+        return 0
     finally:
         conn.close()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply pending SQL migrations to the SQLite database')
+    parser.add_argument('--database', default=str(DEFAULT_DB_PATH), help='path to the SQLite file')
+    parser.add_argument('--plan', action='store_true', help='dry run: list pending migrations without applying them')
+    parser.add_argument('--no-drift', action='store_true', help='skip comparing the schema with models.py')
+    args = parser.parse_args(argv)
+    return run_migrations(args.database, dry_run=args.plan, check_drift=not args.no_drift)
+
 if __name__ == "__main__":
-    run_migrations()
+    sys.exit(main())
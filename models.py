@@ -1,5 +1,6 @@
 from database import db
 from datetime import date, datetime
+from column_types import Money, Code, TRANSACTION_TYPES, FREQUENCIES, BUDGET_PERIODS, GOAL_STATUSES
 
 # User model
 class User(db.Model):
@@ -24,12 +25,23 @@ class Category(db.Model):
     def __repr__(self):
         return f"<Category {self.name}>"
 
+# Category closure table (one row per ancestor/descendant pair, including each category with itself)
+class CategoryClosure(db.Model):
+    __tablename__ = 'category_closure'
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('category.id'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('category.id'), primary_key=True, index=True)
+    depth = db.Column(db.Integer, nullable=False)  # 0 for the self row
+
+    def __repr__(self):
+        return f"<CategoryClosure {self.ancestor_id} -> {self.descendant_id} ({self.depth})>"
+
 # Transaction model
 class Transaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
-    type = db.Column(db.String(10), nullable=False)  # "income" or "expense"
+    amount = db.Column(Money, nullable=False)
+    type = db.Column(Code(TRANSACTION_TYPES, 10), nullable=False)  # "income" or "expense"
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'))
     date = db.Column(db.Date, default=date.today)
     note = db.Column(db.String(200))
@@ -39,16 +51,46 @@ class Transaction(db.Model):
     user = db.relationship('User', backref='transactions')
     category = db.relationship('Category', backref='transactions')
 
+    __table_args__ = (
+        # Keyset pagination order for GET /api/transactions?cursor=... (see migrations/007)
+        db.Index('idx_transaction_user_date_created', 'user_id', 'date', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Transaction {self.type} {self.amount}>"
 
+# Monthly transaction rollup (derived from transaction, kept in step by every write path)
+class TransactionMonthlyRollup(db.Model):
+    __tablename__ = 'transaction_monthly_rollup'
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)  # "YYYY-MM"
+    category_id = db.Column(db.Integer, primary_key=True)  # 0 for uncategorized transactions
+    type = db.Column(Code(TRANSACTION_TYPES, 10), primary_key=True)  # "income" or "expense"
+    total = db.Column(Money, nullable=False, default=0.0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TransactionMonthlyRollup {self.user_id} {self.month} {self.category_id} {self.type}>"
+
+# Change counters per (user, table), used as ETags for list endpoints (user_id 0 for global tables)
+class ChangeVersion(db.Model):
+    __tablename__ = 'change_version'
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ChangeVersion {self.table_name} user={self.user_id} v{self.version}>"
+
 # Budget model
 class Budget(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
-    amount_limit = db.Column(db.Float, nullable=False)
-    period = db.Column(db.String(20), nullable=False)  # "monthly", "yearly"
+    amount_limit = db.Column(Money, nullable=False)
+    period = db.Column(Code(BUDGET_PERIODS, 20), nullable=False)  # "monthly", "yearly"
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -65,10 +107,10 @@ class Goal(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     title = db.Column(db.String(100), nullable=False)
-    target_amount = db.Column(db.Float, nullable=False)
-    current_amount = db.Column(db.Float, default=0.0)
+    target_amount = db.Column(Money, nullable=False)
+    current_amount = db.Column(Money, default=0.0)
     target_date = db.Column(db.Date, nullable=True)
-    status = db.Column(db.String(20), default='active')  # "active", "completed", "paused"
+    status = db.Column(Code(GOAL_STATUSES, 20), default='active')  # "active", "completed", "paused"
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -82,10 +124,11 @@ class RecurringTransaction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
-    type = db.Column(db.String(10), nullable=False)  # "income" or "expense"
-    frequency = db.Column(db.String(20), nullable=False)  # "daily", "weekly", "monthly", "yearly"
+    amount = db.Column(Money, nullable=False)
+    type = db.Column(Code(TRANSACTION_TYPES, 10), nullable=False)  # "income" or "expense"
+    frequency = db.Column(Code(FREQUENCIES, 20), nullable=False)  # "daily", "weekly", "monthly", "yearly"
     next_due_date = db.Column(db.Date, nullable=False)
+    anchor_day = db.Column(db.SmallInteger)  # day of month monthly/yearly occurrences fall on
     is_active = db.Column(db.Boolean, default=True)
     description = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,6 +1,9 @@
+import json
+import time
 from database import db
 from datetime import datetime, date
-from sqlalchemy import func
+from sqlalchemy import func, insert
+from column_types import Money, Code, TRANSACTION_TYPES, GOAL_STATUSES, money_to_db
 
 class BudgetAnalytics:
     """Analytics and calculations for budget-related operations"""
@@ -46,6 +49,49 @@ class BudgetAnalytics:
             'period': budget.period,
             'category_name': budget.category.name if budget.category else None
         }
+    
+    @staticmethod
+    def get_all_budget_statuses(user_id):
+        """Get the status of every budget of a user with a single join/aggregate query"""
+        from models import Budget, Category, Transaction
+        
+        spent_column = func.coalesce(func.sum(Transaction.amount), 0.0)
+        
+        rows = db.session.query(
+            Budget,
+            Category.name,
+            spent_column
+        ).outerjoin(
+            Category, Budget.category_id == Category.id
+        ).outerjoin(
+            Transaction, db.and_(
+                Transaction.user_id == Budget.user_id,
+                Transaction.category_id == Budget.category_id,
+                Transaction.type == 'expense',
+                Transaction.date >= Budget.start_date,
+                Transaction.date <= Budget.end_date
+            )
+        ).filter(
+            Budget.user_id == user_id
+        ).group_by(Budget.id, Category.name).order_by(Budget.id).all()
+        
+        statuses = []
+        for budget, category_name, spent in rows:
+            remaining = budget.amount_limit - spent
+            percentage_used = (spent / budget.amount_limit * 100) if budget.amount_limit > 0 else 0
+            
+            statuses.append({
+                'budget_id': budget.id,
+                'amount_limit': budget.amount_limit,
+                'amount_spent': spent,
+                'amount_remaining': remaining,
+                'percentage_used': round(percentage_used, 2),
+                'is_over_budget': spent > budget.amount_limit,
+                'period': budget.period,
+                'category_name': category_name
+            })
+        
+        return statuses
 
 class GoalCalculations:
     """Goal progress calculations and projections"""
@@ -87,20 +133,70 @@ class GoalCalculations:
     @staticmethod
     def update_goal_progress(goal_id, amount_to_add):
         """Add amount to goal progress"""
-        from models import Goal
-        
-        goal = Goal.query.get(goal_id)
-        if not goal:
-            return False
-        
-        goal.current_amount += amount_to_add
-        
-        # Auto-complete goal if target reached
-        if goal.current_amount >= goal.target_amount:
-            goal.status = 'completed'
+        return int(goal_id) in GoalCalculations.contribute([(goal_id, amount_to_add)])
+    
+    @staticmethod
+    def contribute(contributions, user_id=None, chunk_size=500):
+        """Add amounts to many goals atomically, one UPDATE statement per chunk of goals
+        
+        contributions is an iterable of (goal_id, amount); amounts for the same goal are
+        summed first. The increment (capped at target_amount, which migrated databases
+        enforce with a CHECK) and the auto-completion (status becomes 'completed' once
+        current_amount reaches target_amount) are evaluated by the database, so
+        concurrent contributions are never lost. With user_id, goals of other users are
+        left untouched. Returns {goal_id: {'current_amount', 'target_amount', 'status'}}
+        for every goal that was updated.
+        """
+        from app.change_versions import bump_version
+        
+        totals = {}
+        for goal_id, amount in contributions:
+            totals[int(goal_id)] = totals.get(int(goal_id), 0) + amount
+        
+        # The chunk is sent as one JSON parameter, so the statement text never changes
+        statement = db.text(
+            "WITH contribution (goal_id, amount) AS ("
+            "SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(:contributions)) "
+            "UPDATE goal SET "
+            "current_amount = MIN(COALESCE(goal.current_amount, 0) + contribution.amount, goal.target_amount), "
+            "status = CASE WHEN COALESCE(goal.current_amount, 0) + contribution.amount >= goal.target_amount "
+            "THEN :completed ELSE goal.status END "
+            "FROM contribution WHERE goal.id = contribution.goal_id"
+            + (" AND goal.user_id = :user_id" if user_id is not None else "")
+            + " RETURNING goal.id, goal.user_id, goal.current_amount, goal.target_amount, goal.status"
+        ).bindparams(
+            db.bindparam('completed', 'completed', type_=Code(GOAL_STATUSES, 20))
+        ).columns(
+            id=db.Integer,
+            user_id=db.Integer,
+            current_amount=Money,
+            target_amount=Money,
+            status=Code(GOAL_STATUSES, 20)
+        )
         
-        db.session.commit()
-        return True
+        updated = {}
+        items = list(totals.items())
+        # The amounts go inside the JSON parameter, so they are converted here rather than by Money
+        dialect = db.session.get_bind().dialect
+        for start in range(0, len(items), chunk_size):
+            chunk = [(goal_id, money_to_db(amount, dialect)) for goal_id, amount in items[start:start + chunk_size]]
+            params = {'contributions': json.dumps(chunk), 'user_id': user_id}
+            try:
+                rows = db.session.execute(statement, params).all()
+                for goal_user_id in {row.user_id for row in rows}:
+                    bump_version('goal', goal_user_id)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            
+            for row in rows:
+                updated[row.id] = {
+                    'current_amount': row.current_amount,
+                    'target_amount': row.target_amount,
+                    'status': row.status
+                }
+        return updated
 
 class RecurringTransactionProcessor:
     """Handle recurring transaction processing and scheduling"""
@@ -122,54 +218,472 @@ class RecurringTransactionProcessor:
     
     @staticmethod
     def process_recurring_transaction(recurring_id):
-        """Process a recurring transaction (create actual transaction and update next due date)"""
+        """Book every due occurrence of one recurring transaction (see process_due_recurring_transactions)"""
+        summary = RecurringTransactionProcessor.process_due_recurring_transactions(rule_ids=[recurring_id])
+        return summary['rules'] > 0
+    
+    @staticmethod
+    def process_due_recurring_transactions(as_of=None, user_id=None, rule_ids=None, batch_size=500):
+        """Book all missed occurrences of every due rule, in bulk
+        
+        Due rules are read in id order, batch_size rules at a time. For each batch
+        the transactions (one per occurrence, each with its own date) are inserted
+        and next_due_date is advanced past as_of in the same DB transaction. The
+        advance only applies if next_due_date is still the value that was read, so a
+        concurrent or repeated run never books an occurrence twice.
+        """
         from models import RecurringTransaction, Transaction
-        from dateutil.relativedelta import relativedelta
+        from app.change_versions import bump_version
         
-        recurring = RecurringTransaction.query.get(recurring_id)
-        if not recurring or not recurring.is_active:
-            return False
-        
-        # Create actual transaction
-        transaction = Transaction(
-            user_id=recurring.user_id,
-            category_id=recurring.category_id,
-            amount=recurring.amount,
-            type=recurring.type,
-            date=date.today(),
-            note=f"Recurring: {recurring.description}" if recurring.description else "Recurring transaction"
-        )
+        as_of = as_of or date.today()
+        summary = {'rules': 0, 'transactions': 0, 'batches': 0, 'skipped': 0, 'conflicts': 0}
+        started = time.perf_counter()
         
-        db.session.add(transaction)
+        advance_statement = db.text(
+            "UPDATE recurring_transaction SET next_due_date = :new_due_date "
+            "WHERE id = :rule_id AND next_due_date = :old_due_date AND is_active = 1"
+        )
         
-        # Update next due date based on frequency
-        if recurring.frequency == 'daily':
-            recurring.next_due_date += relativedelta(days=1)
-        elif recurring.frequency == 'weekly':
-            recurring.next_due_date += relativedelta(weeks=1)
-        elif recurring.frequency == 'monthly':
-            recurring.next_due_date += relativedelta(months=1)
-        elif recurring.frequency == 'yearly':
-            recurring.next_due_date += relativedelta(years=1)
+        last_id = 0
+        while True:
+            query = db.session.query(
+                RecurringTransaction.id,
+                RecurringTransaction.user_id,
+                RecurringTransaction.category_id,
+                RecurringTransaction.amount,
+                RecurringTransaction.type,
+                RecurringTransaction.frequency,
+                RecurringTransaction.next_due_date,
+                RecurringTransaction.anchor_day,
+                RecurringTransaction.description
+            ).filter(
+                RecurringTransaction.is_active == True,
+                RecurringTransaction.next_due_date <= as_of,
+                RecurringTransaction.id > last_id
+            )
+            if user_id:
+                query = query.filter(RecurringTransaction.user_id == user_id)
+            if rule_ids is not None:
+                query = query.filter(RecurringTransaction.id.in_(rule_ids))
+            
+            rules = query.order_by(RecurringTransaction.id).limit(batch_size).all()
+            if not rules:
+                break
+            
+            advances = []
+            new_transactions = []
+            skipped = 0
+            for rule in rules:
+                occurrences, next_due_date = RecurringTransactionProcessor.occurrence_dates(
+                    rule.next_due_date, rule.frequency, as_of, rule.anchor_day
+                )
+                if not occurrences:
+                    # Unknown frequency: it would never advance, so leave it alone
+                    skipped += 1
+                    continue
+                
+                advances.append({
+                    'rule_id': rule.id,
+                    'old_due_date': rule.next_due_date.isoformat(),
+                    'new_due_date': next_due_date.isoformat()
+                })
+                note = f"Recurring: {rule.description}" if rule.description else "Recurring transaction"
+                new_transactions.extend({
+                    'user_id': rule.user_id,
+                    'category_id': rule.category_id,
+                    'amount': rule.amount,
+                    'type': rule.type,
+                    'date': occurrence,
+                    'note': note
+                } for occurrence in occurrences)
+            
+            if advances:
+                try:
+                    advanced = db.session.execute(advance_statement, advances).rowcount
+                    if advanced != len(advances):
+                        # Another run booked some of these rules first; re-read this batch
+                        db.session.rollback()
+                        summary['conflicts'] += 1
+                        continue
+                    
+                    db.session.execute(insert(Transaction), new_transactions)
+                    MonthlyRollup.apply(new_transactions)
+                    for rule_user_id in {rule.user_id for rule in rules}:
+                        bump_version('recurring_transaction', rule_user_id)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+                
+                summary['rules'] += len(advances)
+                summary['transactions'] += len(new_transactions)
+                summary['batches'] += 1
+            
+            summary['skipped'] += skipped
+            last_id = rules[-1].id
         
-        db.session.commit()
-        return True
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        return summary
     
     @staticmethod
-    def calculate_next_due_date(start_date, frequency):
-        """Calculate the next due date for a recurring transaction"""
+    def occurrence_dates(start_date, frequency, until, anchor_day=None):
+        """All occurrences from start_date through until, and the first occurrence after it
+        
+        Monthly/yearly occurrences fall on anchor_day (the day of month the rule was
+        set up for, default start_date's), clamped to the month end. start_date may
+        already be clamped, so a rule anchored on the 31st goes Jan 31, Feb 28, Mar 31
+        even when each month is booked by a separate run.
+        """
+        if frequency not in ('daily', 'weekly', 'monthly', 'yearly'):
+            return [], start_date
+        
+        occurrences = []
+        periods = 0
+        current = start_date
+        while current <= until:
+            occurrences.append(current)
+            periods += 1
+            current = RecurringTransactionProcessor.advance_date(start_date, frequency, periods, anchor_day)
+        return occurrences, current
+    
+    @staticmethod
+    def advance_date(start_date, frequency, periods=1, anchor_day=None):
+        """Date that is `periods` occurrences after start_date (monthly/yearly on anchor_day)"""
         from dateutil.relativedelta import relativedelta
         
         if frequency == 'daily':
-            return start_date + relativedelta(days=1)
+            return start_date + relativedelta(days=periods)
         elif frequency == 'weekly':
-            return start_date + relativedelta(weeks=1)
+            return start_date + relativedelta(weeks=periods)
         elif frequency == 'monthly':
-            return start_date + relativedelta(months=1)
+            return start_date + relativedelta(months=periods, day=anchor_day or start_date.day)
         elif frequency == 'yearly':
-            return start_date + relativedelta(years=1)
+            return start_date + relativedelta(years=periods, day=anchor_day or start_date.day)
         else:
             return start_date
+    
+    @staticmethod
+    def calculate_next_due_date(start_date, frequency):
+        """Calculate the next due date for a recurring transaction"""
+        return RecurringTransactionProcessor.advance_date(start_date, frequency)
+    
+    @staticmethod
+    def month_table(first_date, last_date):
+        """Map month index (year * 12 + month - 1) to (ordinal of its 1st, days in month) from first_date to last_date"""
+        from calendar import monthrange
+        
+        table = {}
+        ordinal = first_date.replace(day=1).toordinal()
+        for index in range(first_date.year * 12 + first_date.month - 1, last_date.year * 12 + last_date.month):
+            year, month = divmod(index, 12)
+            length = monthrange(year, month + 1)[1]
+            table[index] = (ordinal, length)
+            ordinal += length
+        return table
+    
+    @staticmethod
+    def occurrence_ordinals(start_date, frequency, until, months, anchor_day=None):
+        """Date ordinals of all occurrences from start_date through until, computed in one pass
+        
+        Same schedule as occurrence_dates() (anchor_day clamped to the month end) but without a relativedelta call per occurrence: daily/weekly rules
+        are a range of ordinals, monthly/yearly rules step through month indexes and
+        look up month starts/lengths in months (a month_table() covering the span).
+        """
+        until_ordinal = until.toordinal()
+        if frequency in ('daily', 'weekly'):
+            return range(start_date.toordinal(), until_ordinal + 1, 1 if frequency == 'daily' else 7)
+        if frequency not in ('monthly', 'yearly'):
+            return []
+        
+        day = anchor_day or start_date.day
+        first_index = start_date.year * 12 + start_date.month - 1
+        last_index = until.year * 12 + until.month - 1
+        ordinals = [
+            months[index][0] + min(day, months[index][1]) - 1
+            for index in range(first_index, last_index + 1, 1 if frequency == 'monthly' else 12)
+        ]
+        # Only the occurrence in until's own month can fall after it
+        if ordinals and ordinals[-1] > until_ordinal:
+            ordinals.pop()
+        return ordinals
+
+class MonthlyRollup:
+    """Transaction sums and counts per (user, month, category, type)
+    
+    Every transaction write path calls apply() inside its own DB transaction,
+    so the rollup always matches the transaction table once committed.
+    """
+    
+    UPSERT = db.text(
+        "INSERT INTO transaction_monthly_rollup (user_id, month, category_id, type, total, count) "
+        "VALUES (:user_id, :month, :category_id, :type, :total, :count) "
+        "ON CONFLICT (user_id, month, category_id, type) "
+        "DO UPDATE SET total = total + excluded.total, count = count + excluded.count"
+    ).bindparams(
+        db.bindparam('type', type_=Code(TRANSACTION_TYPES, 10)),
+        db.bindparam('total', type_=Money())
+    )
+    
+    @staticmethod
+    def apply(transactions):
+        """Add new transactions (Transaction objects or dicts of column values) to the rollup"""
+        deltas = {}
+        for transaction in transactions:
+            if isinstance(transaction, dict):
+                values = transaction
+            else:
+                values = {name: getattr(transaction, name) for name in ('user_id', 'date', 'category_id', 'type', 'amount')}
+            
+            transaction_date = values.get('date') or date.today()
+            key = (values['user_id'], transaction_date.strftime('%Y-%m'), int(values.get('category_id') or 0), values['type'])
+            total, count = deltas.get(key, (0.0, 0))
+            deltas[key] = (total + values['amount'], count + 1)
+        
+        if deltas:
+            db.session.execute(MonthlyRollup.UPSERT, [
+                {'user_id': user_id, 'month': month, 'category_id': category_id, 'type': transaction_type,
+                 'total': total, 'count': count}
+                for (user_id, month, category_id, transaction_type), (total, count) in deltas.items()
+            ])
+    
+    @staticmethod
+    def move_category(source_category_id, target_category_id):
+        """Fold the rollup rows of one category into another (after moving its transactions)"""
+        params = {'source_id': source_category_id, 'target_id': target_category_id}
+        db.session.execute(db.text(
+            "INSERT INTO transaction_monthly_rollup (user_id, month, category_id, type, total, count) "
+            "SELECT user_id, month, :target_id, type, total, count FROM transaction_monthly_rollup "
+            "WHERE category_id = :source_id "
+            "ON CONFLICT (user_id, month, category_id, type) "
+            "DO UPDATE SET total = total + excluded.total, count = count + excluded.count"
+        ), params)
+        db.session.execute(db.text(
+            "DELETE FROM transaction_monthly_rollup WHERE category_id = :source_id"
+        ), params)
+    
+    @staticmethod
+    def rebuild(user_id=None):
+        """Recompute the rollup from the transaction table (backfill / repair), for one user or all"""
+        where = "WHERE user_id = :user_id" if user_id is not None else ""
+        params = {'user_id': user_id}
+        db.session.execute(db.text(f"DELETE FROM transaction_monthly_rollup {where}"), params)
+        db.session.execute(db.text(
+            "INSERT INTO transaction_monthly_rollup (user_id, month, category_id, type, total, count) "
+            "SELECT user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type, SUM(amount), COUNT(*) "
+            f'FROM "transaction" {where} '
+            "GROUP BY user_id, strftime('%Y-%m', date), COALESCE(category_id, 0), type"
+        ), params)
+    
+    @staticmethod
+    def ensure_rollup():
+        """Backfill the rollup if transactions exist but it has never been populated"""
+        from models import Transaction, TransactionMonthlyRollup
+        
+        if db.session.query(TransactionMonthlyRollup.count).first() is None and db.session.query(Transaction.id).first() is not None:
+            MonthlyRollup.rebuild()
+            db.session.commit()
+    
+    @staticmethod
+    def split_period(start_date=None, end_date=None):
+        """Split a date range into whole months (read from the rollup) and partial months at its edges
+        
+        Returns (months, edges). months is a (first, last) pair of 'YYYY-MM' keys, either of
+        which is None when unbounded, or None when no whole month is covered. edges is a list
+        of (start, end) date ranges that still have to be read from the transaction table.
+        """
+        from dateutil.relativedelta import relativedelta
+        from datetime import timedelta
+        
+        edges = []
+        first = last = None
+        
+        if start_date is not None:
+            first = start_date.replace(day=1)
+            if start_date.day != 1:
+                first += relativedelta(months=1)
+                month_end = first - timedelta(days=1)
+                edges.append((start_date, min(month_end, end_date) if end_date else month_end))
+        
+        if end_date is not None:
+            last = end_date.replace(day=1)
+            if (end_date + timedelta(days=1)).day != 1:
+                edge_start = max(last, start_date) if start_date else last
+                # Skip when the whole range sits inside the start month edge
+                if not edges or edge_start > edges[0][1]:
+                    edges.append((edge_start, end_date))
+                last -= relativedelta(months=1)
+        
+        if first is not None and last is not None and first > last:
+            return None, edges
+        return (first.strftime('%Y-%m') if first else None, last.strftime('%Y-%m') if last else None), edges
+    
+    @staticmethod
+    def month_filter(first_month, last_month):
+        """Filter clauses on the rollup month column for split_period() bounds"""
+        from models import TransactionMonthlyRollup
+        
+        clauses = []
+        if first_month is not None:
+            clauses.append(TransactionMonthlyRollup.month >= first_month)
+        if last_month is not None:
+            clauses.append(TransactionMonthlyRollup.month <= last_month)
+        return clauses
+    
+    @staticmethod
+    def edge_filter(edges):
+        """Filter clause on Transaction.date covering the split_period() edge ranges"""
+        from models import Transaction
+        
+        return db.or_(*[Transaction.date.between(start, end) for start, end in edges])
+
+class CashFlowForecast:
+    """Project a user's balance forward from their active recurring rules"""
+    
+    @staticmethod
+    def current_balance(user_id, as_of):
+        """Income minus expenses booked on or before as_of (whole months come from the rollup)"""
+        from models import Transaction, TransactionMonthlyRollup
+        
+        totals = {'income': 0.0, 'expense': 0.0}
+        months, edges = MonthlyRollup.split_period(None, as_of)
+        
+        if months is not None:
+            rows = db.session.query(
+                TransactionMonthlyRollup.type,
+                func.sum(TransactionMonthlyRollup.total)
+            ).filter(
+                TransactionMonthlyRollup.user_id == user_id,
+                *MonthlyRollup.month_filter(*months)
+            ).group_by(TransactionMonthlyRollup.type).all()
+            for transaction_type, total in rows:
+                totals[transaction_type] += total or 0
+        
+        if edges:
+            rows = db.session.query(
+                Transaction.type,
+                func.sum(Transaction.amount)
+            ).filter(
+                Transaction.user_id == user_id,
+                MonthlyRollup.edge_filter(edges)
+            ).group_by(Transaction.type).all()
+            for transaction_type, total in rows:
+                totals[transaction_type] += total or 0
+        
+        return totals['income'] - totals['expense']
+    
+    @staticmethod
+    def forecast(user_id, months=6, as_of=None):
+        """Day-by-day projected balance from as_of (default today) to `months` months later
+        
+        The series starts from the current balance and adds every projected occurrence of
+        the user's active recurring rules plus transactions already booked in the future.
+        Occurrences that are due but not yet booked (next_due_date <= as_of) are counted
+        on the first day, since the recurring engine books them on its next run.
+        """
+        from models import RecurringTransaction, Transaction
+        from dateutil.relativedelta import relativedelta
+        from itertools import accumulate
+        from bisect import bisect_left
+        from datetime import timedelta
+        
+        start_date = as_of or date.today()
+        end_date = start_date + relativedelta(months=months)
+        start_ordinal = start_date.toordinal()
+        days = end_date.toordinal() - start_ordinal + 1
+        
+        income = [0.0] * days
+        expense = [0.0] * days
+        
+        rules = db.session.query(
+            RecurringTransaction.amount,
+            RecurringTransaction.type,
+            RecurringTransaction.frequency,
+            RecurringTransaction.next_due_date,
+            RecurringTransaction.anchor_day
+        ).filter(
+            RecurringTransaction.user_id == user_id,
+            RecurringTransaction.is_active == True,
+            RecurringTransaction.next_due_date <= end_date
+        ).all()
+        
+        # Daily/weekly rules run to the end of the horizon, so each one only marks its
+        # first day here; a strided running sum then spreads it over every later occurrence
+        strided = {(step, transaction_type): [0.0] * days for step in (1, 7) for transaction_type in ('income', 'expense')}
+        
+        occurrence_count = 0
+        if rules:
+            month_table = RecurringTransactionProcessor.month_table(
+                min(min(rule.next_due_date for rule in rules), start_date), end_date
+            )
+            for rule in rules:
+                ordinals = RecurringTransactionProcessor.occurrence_ordinals(
+                    rule.next_due_date, rule.frequency, end_date, month_table, rule.anchor_day
+                )
+                if not ordinals:
+                    continue
+                series = income if rule.type == 'income' else expense
+                amount = rule.amount
+                overdue = bisect_left(ordinals, start_ordinal)
+                series[0] += overdue * amount
+                if isinstance(ordinals, range):
+                    if overdue < len(ordinals):
+                        strided[(ordinals.step, rule.type)][ordinals[overdue] - start_ordinal] += amount
+                else:
+                    for ordinal in ordinals[overdue:]:
+                        series[ordinal - start_ordinal] += amount
+                occurrence_count += len(ordinals)
+        
+        for (step, transaction_type), marks in strided.items():
+            series = income if transaction_type == 'income' else expense
+            for offset in range(days):
+                if offset >= step:
+                    marks[offset] += marks[offset - step]
+                series[offset] += marks[offset]
+        
+        # Transactions already booked with a future date
+        booked = db.session.query(
+            Transaction.date,
+            Transaction.type,
+            func.sum(Transaction.amount)
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.date > start_date,
+            Transaction.date <= end_date
+        ).group_by(Transaction.date, Transaction.type).all()
+        for transaction_date, transaction_type, total in booked:
+            series = income if transaction_type == 'income' else expense
+            series[transaction_date.toordinal() - start_ordinal] += total or 0
+        
+        opening_balance = CashFlowForecast.current_balance(user_id, start_date)
+        balances = list(accumulate(
+            (day_income - day_expense for day_income, day_expense in zip(income, expense)),
+            initial=opening_balance
+        ))[1:]
+        
+        lowest = min(range(days), key=balances.__getitem__)
+        return {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'opening_balance': round(opening_balance, 2),
+            'closing_balance': round(balances[-1], 2),
+            'projected_income': round(sum(income), 2),
+            'projected_expenses': round(sum(expense), 2),
+            'lowest_balance': {
+                'date': (start_date + timedelta(days=lowest)).isoformat(),
+                'balance': round(balances[lowest], 2)
+            },
+            'recurring_rules': len(rules),
+            'occurrences': occurrence_count,
+            'days': [
+                {
+                    'date': date.fromordinal(start_ordinal + offset).isoformat(),
+                    'income': round(income[offset], 2),
+                    'expense': round(expense[offset], 2),
+                    'balance': round(balances[offset], 2)
+                }
+                for offset in range(days)
+            ]
+        }
 
 class TransactionAnalytics:
     """Advanced transaction analytics and reporting"""
@@ -177,65 +691,122 @@ class TransactionAnalytics:
     @staticmethod
     def get_monthly_summary(user_id, year, month):
         """Get comprehensive monthly transaction summary"""
-        from models import Transaction, Category
+        from models import Category, TransactionMonthlyRollup
         from calendar import monthrange
         
-        # Get first and last day of month
-        start_date = date(year, month, 1)
         last_day = monthrange(year, month)[1]
-        end_date = date(year, month, last_day)
         
-        transactions = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
-        ).all()
-        
-        total_income = sum(t.amount for t in transactions if t.type == 'income')
-        total_expenses = sum(t.amount for t in transactions if t.type == 'expense')
-        net_amount = total_income - total_expenses
+        # Read the precomputed (category, type) sums of the month from the rollup
+        rows = db.session.query(
+            Category.name,
+            TransactionMonthlyRollup.type,
+            func.sum(TransactionMonthlyRollup.total),
+            func.sum(TransactionMonthlyRollup.count)
+        ).outerjoin(
+            Category, TransactionMonthlyRollup.category_id == Category.id
+        ).filter(
+            TransactionMonthlyRollup.user_id == user_id,
+            TransactionMonthlyRollup.month == f"{year}-{month:02d}"
+        ).group_by(Category.name, TransactionMonthlyRollup.type).all()
+        
+        totals = {'income': 0, 'expense': 0}
+        transaction_count = 0
         
         # Category breakdown
         category_breakdown = {}
-        for transaction in transactions:
-            cat_name = transaction.category.name if transaction.category else 'Uncategorized'
+        for cat_name, transaction_type, amount, count in rows:
+            cat_name = cat_name if cat_name is not None else 'Uncategorized'
             if cat_name not in category_breakdown:
                 category_breakdown[cat_name] = {'income': 0, 'expense': 0, 'count': 0}
-            category_breakdown[cat_name][transaction.type] += transaction.amount
-            category_breakdown[cat_name]['count'] += 1
+            category_breakdown[cat_name][transaction_type] += amount
+            category_breakdown[cat_name]['count'] += count
+            totals[transaction_type] += amount
+            transaction_count += count
+        
+        total_income = totals['income']
+        total_expenses = totals['expense']
+        net_amount = total_income - total_expenses
         
         return {
             'period': f"{year}-{month:02d}",
             'total_income': total_income,
             'total_expenses': total_expenses,
             'net_amount': net_amount,
-            'transaction_count': len(transactions),
+            'transaction_count': transaction_count,
             'category_breakdown': category_breakdown,
             'average_daily_expense': total_expenses / last_day if total_expenses > 0 else 0
         }
     
     @staticmethod
-    def get_spending_trends(user_id, months=6):
-        """Get spending trends over the last N months"""
-        from models import Transaction
+    def get_spending_trends(user_id, months=6, granularity='monthly'):
+        """Get spending trends over the last N months
+        
+        Buckets are computed in SQL with a single GROUP BY and every bucket in
+        the window is present (zero-filled). granularity is 'monthly' (keys
+        YYYY-MM), 'weekly' (keys are the Monday of each week) or 'daily'.
+        """
+        from models import Transaction, TransactionMonthlyRollup
         from dateutil.relativedelta import relativedelta
+        from datetime import timedelta
         
         end_date = date.today()
         start_date = end_date - relativedelta(months=months)
         
-        transactions = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
-        ).order_by(Transaction.date).all()
-        
-        # Group by month
+        # SQLite date functions; dates are stored as YYYY-MM-DD text
+        if granularity == 'monthly':
+            bucket = func.strftime('%Y-%m', Transaction.date)
+        elif granularity == 'weekly':
+            bucket = func.date(Transaction.date, '-6 days', 'weekday 1')
+        elif granularity == 'daily':
+            bucket = func.date(Transaction.date)
+        else:
+            raise ValueError("granularity must be 'monthly', 'weekly' or 'daily'")
+        
+        if granularity == 'monthly':
+            # Whole months come from the rollup, only the partial first/last month from transactions
+            month_bounds, edges = MonthlyRollup.split_period(start_date, end_date)
+            rows = []
+            if month_bounds:
+                rows += db.session.query(
+                    TransactionMonthlyRollup.month,
+                    TransactionMonthlyRollup.type,
+                    func.sum(TransactionMonthlyRollup.total)
+                ).filter(
+                    TransactionMonthlyRollup.user_id == user_id,
+                    *MonthlyRollup.month_filter(*month_bounds)
+                ).group_by(TransactionMonthlyRollup.month, TransactionMonthlyRollup.type).all()
+            date_filter = [MonthlyRollup.edge_filter(edges)] if edges else None
+        else:
+            rows = []
+            date_filter = [Transaction.date >= start_date, Transaction.date <= end_date]
+        
+        if date_filter:
+            rows += db.session.query(
+                bucket,
+                Transaction.type,
+                func.sum(Transaction.amount)
+            ).filter(
+                Transaction.user_id == user_id,
+                *date_filter
+            ).group_by(bucket, Transaction.type).all()
+        
+        # Dense series, oldest first
         monthly_data = {}
-        for transaction in transactions:
-            month_key = transaction.date.strftime('%Y-%m')
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {'income': 0, 'expense': 0}
-            monthly_data[month_key][transaction.type] += transaction.amount
+        if granularity == 'monthly':
+            current = start_date.replace(day=1)
+            while current <= end_date:
+                monthly_data[current.strftime('%Y-%m')] = {'income': 0, 'expense': 0}
+                current += relativedelta(months=1)
+        else:
+            step = timedelta(weeks=1) if granularity == 'weekly' else timedelta(days=1)
+            current = start_date - timedelta(days=start_date.weekday()) if granularity == 'weekly' else start_date
+            while current <= end_date:
+                monthly_data[current.isoformat()] = {'income': 0, 'expense': 0}
+                current += step
+        
+        for bucket_key, transaction_type, amount in rows:
+            if bucket_key in monthly_data:
+                monthly_data[bucket_key][transaction_type] += amount
         
         return monthly_data
 
@@ -244,67 +815,137 @@ class CategoryManager:
     
     @staticmethod
     def get_category_tree_with_totals(user_id, start_date=None, end_date=None):
-        """Get category tree with transaction totals"""
-        from models import Category, Transaction
-        
-        # Build transaction totals query
-        query = Transaction.query.filter(Transaction.user_id == user_id)
-        
-        if start_date:
-            query = query.filter(Transaction.date >= start_date)
-        if end_date:
-            query = query.filter(Transaction.date <= end_date)
+        """Get category tree (any depth) with transaction totals rolled up per subtree"""
+        from models import Category, Transaction, CategoryClosure, TransactionMonthlyRollup
+        
+        # Every transaction counts towards all of its category's ancestors. Whole months
+        # are summed from the rollup, partial months at the range edges from transactions.
+        month_bounds, edges = MonthlyRollup.split_period(start_date, end_date)
+        rows = []
+        if month_bounds:
+            rows += db.session.query(
+                CategoryClosure.ancestor_id,
+                TransactionMonthlyRollup.type,
+                func.sum(TransactionMonthlyRollup.total),
+                func.sum(TransactionMonthlyRollup.count)
+            ).join(
+                CategoryClosure, CategoryClosure.descendant_id == TransactionMonthlyRollup.category_id
+            ).filter(
+                TransactionMonthlyRollup.user_id == user_id,
+                *MonthlyRollup.month_filter(*month_bounds)
+            ).group_by(CategoryClosure.ancestor_id, TransactionMonthlyRollup.type).all()
+        if edges:
+            rows += db.session.query(
+                CategoryClosure.ancestor_id,
+                Transaction.type,
+                func.sum(Transaction.amount),
+                func.count(Transaction.id)
+            ).join(
+                CategoryClosure, CategoryClosure.descendant_id == Transaction.category_id
+            ).filter(
+                Transaction.user_id == user_id,
+                MonthlyRollup.edge_filter(edges)
+            ).group_by(CategoryClosure.ancestor_id, Transaction.type).all()
         
-        transactions = query.all()
-        
-        # Calculate totals per category
         category_totals = {}
-        for transaction in transactions:
-            cat_id = transaction.category_id or 0  # 0 for uncategorized
-            if cat_id not in category_totals:
-                category_totals[cat_id] = {'income': 0, 'expense': 0, 'count': 0}
-            category_totals[cat_id][transaction.type] += transaction.amount
-            category_totals[cat_id]['count'] += 1
-        
-        # Get all categories
-        categories = Category.query.all()
-        
-        # Build tree with totals
-        category_tree = []
-        parent_categories = [cat for cat in categories if cat.parent_id is None]
-        
-        for parent in parent_categories:
-            parent_total = category_totals.get(parent.id, {'income': 0, 'expense': 0, 'count': 0})
-            
-            parent_data = {
-                'id': parent.id,
-                'name': parent.name,
-                'parent_id': parent.parent_id,
-                'totals': parent_total,
+        for category_id, transaction_type, amount, count in rows:
+            if category_id not in category_totals:
+                category_totals[category_id] = {'income': 0, 'expense': 0, 'count': 0}
+            category_totals[category_id][transaction_type] += amount
+            category_totals[category_id]['count'] += count
+        
+        # Build tree with totals in a single pass over the categories
+        categories = db.session.query(Category.id, Category.name, Category.parent_id).order_by(Category.id).all()
+        
+        nodes = {}
+        for category_id, name, parent_id in categories:
+            nodes[category_id] = {
+                'id': category_id,
+                'name': name,
+                'parent_id': parent_id,
+                'totals': category_totals.get(category_id, {'income': 0, 'expense': 0, 'count': 0}),
                 'children': []
             }
-            
-            # Get children with totals
-            children = [cat for cat in categories if cat.parent_id == parent.id]
-            for child in children:
-                child_total = category_totals.get(child.id, {'income': 0, 'expense': 0, 'count': 0})
-                child_data = {
-                    'id': child.id,
-                    'name': child.name,
-                    'parent_id': child.parent_id,
-                    'totals': child_total
-                }
-                parent_data['children'].append(child_data)
-                
-                # Add child totals to parent
-                parent_data['totals']['income'] += child_total['income']
-                parent_data['totals']['expense'] += child_total['expense']
-                parent_data['totals']['count'] += child_total['count']
-            
-            category_tree.append(parent_data)
+        
+        category_tree = []
+        for node in nodes.values():
+            if node['parent_id'] is None:
+                category_tree.append(node)
+            elif node['parent_id'] in nodes:
+                nodes[node['parent_id']]['children'].append(node)
         
         return category_tree
     
+    @staticmethod
+    def add_category_to_closure(category_id, parent_id=None):
+        """Insert closure rows for a new (flushed) category: itself plus every ancestor of its parent"""
+        db.session.execute(db.text(
+            "INSERT INTO category_closure (ancestor_id, descendant_id, depth) "
+            "SELECT ancestor_id, :category_id, depth + 1 FROM category_closure WHERE descendant_id = :parent_id "
+            "UNION ALL SELECT :category_id, :category_id, 0"
+        ), {'category_id': category_id, 'parent_id': parent_id})
+    
+    @staticmethod
+    def move_category_in_closure(category_id, new_parent_id=None):
+        """Re-link a category's whole subtree under a new parent (None for top level)"""
+        params = {'category_id': category_id, 'parent_id': new_parent_id}
+        
+        # Detach the subtree from its old ancestors, keeping the links inside the subtree
+        db.session.execute(db.text(
+            "DELETE FROM category_closure "
+            "WHERE descendant_id IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = :category_id) "
+            "AND ancestor_id NOT IN (SELECT descendant_id FROM category_closure WHERE ancestor_id = :category_id)"
+        ), params)
+        
+        if new_parent_id is not None:
+            db.session.execute(db.text(
+                "INSERT INTO category_closure (ancestor_id, descendant_id, depth) "
+                "SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1 "
+                "FROM category_closure above CROSS JOIN category_closure below "
+                "WHERE above.descendant_id = :parent_id AND below.ancestor_id = :category_id"
+            ), params)
+    
+    @staticmethod
+    def remove_category_from_closure(category_id):
+        """Drop every closure row that references a category"""
+        db.session.execute(db.text(
+            "DELETE FROM category_closure WHERE ancestor_id = :category_id OR descendant_id = :category_id"
+        ), {'category_id': category_id})
+    
+    @staticmethod
+    def is_descendant(category_id, ancestor_id):
+        """True if category_id is ancestor_id itself or somewhere below it"""
+        from models import CategoryClosure
+        
+        return db.session.query(CategoryClosure.depth).filter_by(
+            ancestor_id=ancestor_id, descendant_id=category_id
+        ).first() is not None
+    
+    @staticmethod
+    def rebuild_closure():
+        """Recompute the closure table from category.parent_id (backfill / repair)"""
+        db.session.execute(db.text("DELETE FROM category_closure"))
+        db.session.execute(db.text(
+            "WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS ("
+            "SELECT id, id, 0 FROM category "
+            "UNION ALL "
+            "SELECT tree.ancestor_id, category.id, tree.depth + 1 "
+            "FROM tree JOIN category ON category.parent_id = tree.descendant_id "
+            "WHERE tree.depth < 64"  # guards against cycles in bad data
+            ") "
+            "INSERT OR IGNORE INTO category_closure (ancestor_id, descendant_id, depth) "
+            "SELECT ancestor_id, descendant_id, depth FROM tree"
+        ))
+    
+    @staticmethod
+    def ensure_closure():
+        """Backfill the closure table if categories exist but it has never been populated"""
+        from models import Category, CategoryClosure
+        
+        if db.session.query(CategoryClosure.depth).first() is None and db.session.query(Category.id).first() is not None:
+            CategoryManager.rebuild_closure()
+            db.session.commit()
+    
     @staticmethod
     def merge_categories(source_category_id, target_category_id):
         """Merge one category into another (move all transactions)"""
@@ -314,6 +955,7 @@ class CategoryManager:
         Transaction.query.filter_by(category_id=source_category_id).update(
             {'category_id': target_category_id}
         )
+        MonthlyRollup.move_category(source_category_id, target_category_id)
         
         # Update all budgets
         Budget.query.filter_by(category_id=source_category_id).update(
@@ -328,7 +970,17 @@ class CategoryManager:
         # Delete the source category
         Category.query.filter_by(id=source_category_id).delete()
         
+        # Subcategories of the source keep their parent_id, so recompute the hierarchy
+        CategoryManager.rebuild_closure()
+        
+        # Budget and recurring lists embed category names, so their ETags include this version
+        from app.change_versions import bump_version
+        bump_version('category')
+        
         db.session.commit()
+        
+        from app.category_cache import invalidate_categories
+        invalidate_categories()
         return True
 
 # Healthcheck for analytics (advanced, placeholder)
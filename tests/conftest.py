@@ -0,0 +1,61 @@
+import os
+import sys
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from database import db
+
+@pytest.fixture
+def app(tmp_path):
+    """App on a fresh SQLite file created from models.py"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'REQUEST_LOG_MODE': 'off',
+        'QUERY_STATS_HEADERS': True,
+        'QUERY_BUDGET_STRICT': True
+    })
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def statements(app):
+    """SQL statements sent to the database, in order"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    """App on a SQLite file built by the SQL migrations (with their CHECK constraints)"""
+    from migrations.run_migrations import run_migrations
+
+    database_path = tmp_path / 'migrated.db'
+    assert run_migrations(str(database_path), check_drift=False) == 0
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'REQUEST_LOG_MODE': 'off'
+    })
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
@@ -0,0 +1,46 @@
+from database import db
+from models import Category, Transaction
+
+def add_category(app, name='Groceries'):
+    with app.app_context():
+        category = Category(name=name)
+        db.session.add(category)
+        db.session.commit()
+        return category.id
+
+def test_bulk_insert_is_one_statement(app, client, statements):
+    category_id = add_category(app)
+    rows = [{'amount': 10 + i, 'type': 'expense', 'category_id': category_id, 'note': f"row {i}"} for i in range(5)]
+
+    response = client.post('/api/transactions/bulk', json={'transactions': rows})
+
+    assert response.status_code == 201
+    inserts = [statement for statement in statements if statement.startswith('INSERT INTO "transaction"')]
+    assert len(inserts) == 1
+    # category lookup, INSERT, MAX(id), rollup upsert
+    assert int(response.headers['X-DB-Queries']) == 4
+
+def test_bulk_insert_returns_ids_in_request_order(app, client):
+    category_id = add_category(app)
+    rows = [
+        {'amount': 1, 'type': 'expense', 'category_id': category_id, 'note': 'first'},
+        {'amount': 2, 'type': 'bogus'},
+        {'amount': 3, 'type': 'income', 'note': 'third'}
+    ]
+
+    results = client.post('/api/transactions/bulk', json={'transactions': rows}).get_json()['data']['results']
+
+    assert [result['status'] for result in results] == ['created', 'error', 'created']
+    with app.app_context():
+        assert db.session.get(Transaction, results[0]['id']).note == 'first'
+        assert db.session.get(Transaction, results[2]['id']).note == 'third'
+
+def test_bulk_insert_ids_across_chunks(app, client):
+    app.config['BULK_TRANSACTION_CHUNK_SIZE'] = 2
+    rows = [{'amount': i + 1, 'type': 'income', 'note': str(i)} for i in range(5)]
+
+    results = client.post('/api/transactions/bulk', json={'transactions': rows}).get_json()['data']['results']
+
+    with app.app_context():
+        notes = [db.session.get(Transaction, result['id']).note for result in results]
+    assert notes == [str(i) for i in range(5)]
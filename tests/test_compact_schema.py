@@ -0,0 +1,43 @@
+from datetime import date
+from app import create_app
+from database import db
+from models import Transaction
+
+def make_app(tmp_path, name, compact):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / name}",
+        'REQUEST_LOG_MODE': 'off',
+        'COMPACT_SCHEMA': compact
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+def stored_row(app):
+    with app.app_context():
+        return tuple(db.session.execute(db.text('SELECT amount, type FROM "transaction"')).one())
+
+def test_apps_with_different_layouts_share_a_process(tmp_path):
+    legacy = make_app(tmp_path, 'legacy.db', False)
+    compact = make_app(tmp_path, 'compact.db', True)
+
+    # Interleaved, so neither app can be relying on whichever layout was set last
+    for app in (legacy, compact, legacy):
+        with app.app_context():
+            db.session.add(Transaction(user_id=1, amount=12.34, type='expense', date=date(2024, 1, 1)))
+            db.session.commit()
+
+    with legacy.app_context():
+        assert db.session.execute(db.text('SELECT amount, type FROM "transaction"')).all() == [
+            (12.34, 'expense'), (12.34, 'expense')
+        ]
+        assert [(t.amount, t.type) for t in Transaction.query] == [(12.34, 'expense')] * 2
+    assert stored_row(compact) == (1234, 2)
+    with compact.app_context():
+        assert [(t.amount, t.type) for t in Transaction.query] == [(12.34, 'expense')]
+
+    for app in (legacy, compact):
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
@@ -0,0 +1,28 @@
+import pytest
+from database import db
+from models import Goal, User
+
+@pytest.fixture(params=['create_all', 'migrated'])
+def goal_app(request, app, migrated_app):
+    """Both schemas: migrated databases have CHECK (current_amount <= target_amount)"""
+    app = app if request.param == 'create_all' else migrated_app
+    with app.app_context():
+        db.session.add(User(id=1, email='user1@test.local', password_hash='x'))
+        db.session.add(Goal(id=1, user_id=1, title='Bike', target_amount=100, current_amount=90))
+        db.session.add(Goal(id=2, user_id=1, title='Trip', target_amount=500, current_amount=0))
+        db.session.commit()
+    return app
+
+def test_overshooting_contribution_is_capped(goal_app):
+    response = goal_app.test_client().post('/api/goals/contributions', json={'contributions': [
+        {'goal_id': 1, 'amount': 25},
+        {'goal_id': 2, 'amount': 40}
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()['data']['results']
+    assert [result['status'] for result in results] == ['applied', 'applied']
+    assert results[0]['current_amount'] == 100
+    assert results[0]['goal_status'] == 'completed'
+    assert results[1]['current_amount'] == 40
+    assert results[1]['goal_status'] == 'active'
@@ -0,0 +1,49 @@
+from datetime import date
+import pytest
+from database import db
+from models import Budget, Category, RecurringTransaction, Transaction
+from app.query_stats import QueryBudgetExceeded
+
+def seed(app):
+    with app.app_context():
+        parent = Category(name='Housing')
+        db.session.add(parent)
+        db.session.flush()
+        categories = [parent] + [Category(name=name, parent_id=parent.id) for name in ('Rent', 'Power', 'Water')]
+        db.session.add_all(categories[1:])
+        db.session.flush()
+        for index, category in enumerate(categories):
+            db.session.add_all(
+                Transaction(user_id=1, amount=10 + day, type='expense', category_id=category.id,
+                            date=date(2026, 1, day + 1), note=f"{category.name} {day}")
+                for day in range(10)
+            )
+            db.session.add(Budget(user_id=1, category_id=category.id, amount_limit=500, period='monthly',
+                                  start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)))
+            db.session.add(RecurringTransaction(user_id=1, category_id=category.id, amount=50 + index,
+                                                type='expense', frequency='monthly',
+                                                next_due_date=date(2030, 1, index + 1), anchor_day=index + 1))
+        db.session.commit()
+
+@pytest.mark.parametrize('url', [
+    '/api/transactions/',
+    '/api/transactions/?cursor=',
+    '/api/budgets/',
+    '/api/recurring-transactions/',
+    '/api/categories/flat'
+])
+def test_list_routes_stay_within_query_budget(app, client, url):
+    seed(app)
+
+    # QUERY_BUDGET_STRICT makes an overrun raise instead of returning
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.get_json()['data']
+
+def test_exceeded_budget_raises_in_strict_mode(app, client, monkeypatch):
+    seed(app)
+    monkeypatch.setattr(app.view_functions['budgets.get_budgets'], 'query_budget', 0)
+
+    with pytest.raises(QueryBudgetExceeded, match='budgets.get_budgets ran'):
+        client.get('/api/budgets/')
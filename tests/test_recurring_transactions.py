@@ -0,0 +1,54 @@
+from datetime import date
+from database import db
+from models import Category, RecurringTransaction, Transaction
+from models_standard import RecurringTransactionProcessor
+
+def add_rule(app):
+    with app.app_context():
+        category = Category(name='Rent')
+        db.session.add(category)
+        db.session.flush()
+        rule = RecurringTransaction(user_id=1, category_id=category.id, amount=900, type='expense',
+                                    frequency='monthly', next_due_date=date(2030, 1, 1))
+        db.session.add(rule)
+        db.session.commit()
+        return rule.id
+
+def test_update_rejects_non_string_description(app, client):
+    rule_id = add_rule(app)
+
+    response = client.put(f"/api/recurring-transactions/{rule_id}", json={'description': 5})
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == "Description must be a string"
+
+def test_update_description(app, client):
+    rule_id = add_rule(app)
+
+    response = client.put(f"/api/recurring-transactions/{rule_id}", json={'description': '  Flat  '})
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['recurring_transaction']['description'] == 'Flat'
+    response = client.put(f"/api/recurring-transactions/{rule_id}", json={'description': None})
+    assert response.get_json()['data']['recurring_transaction']['description'] is None
+
+def test_month_end_rule_keeps_its_day_across_runs(app, client):
+    with app.app_context():
+        category = Category(name='Rent')
+        db.session.add(category)
+        db.session.commit()
+        category_id = category.id
+
+    response = client.post('/api/recurring-transactions/', json={
+        'category_id': category_id, 'amount': 50, 'type': 'expense',
+        'frequency': 'monthly', 'next_due_date': '2026-01-31'
+    })
+    assert response.status_code == 201
+
+    with app.app_context():
+        # One run per day, as the nightly job does
+        for day in range(date(2026, 1, 31).toordinal(), date(2026, 5, 1).toordinal()):
+            RecurringTransactionProcessor.process_due_recurring_transactions(as_of=date.fromordinal(day))
+        dates = [row.date for row in Transaction.query.order_by(Transaction.date)]
+
+    assert dates == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
@@ -0,0 +1,66 @@
+import pytest
+from app import create_app
+from database import db
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build apps with their own database and profiler settings"""
+    apps = []
+
+    def build(name, **config):
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / f'{name}.db'}",
+            'REQUEST_LOG_MODE': 'off',
+            'PROFILER_DIR': str(tmp_path / f'{name}-profiles'),
+            **config
+        })
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield build
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+def test_profiles_not_found_without_token(make_app):
+    client = make_app('plain').test_client()
+
+    response = client.get('/api/admin/profiles', headers={'X-Profile-Token': 'secret'})
+
+    assert response.status_code == 404
+
+def test_profiles_reject_wrong_token(make_app):
+    client = make_app('guarded', PROFILER_TOKEN='secret').test_client()
+
+    assert client.get('/api/admin/profiles').status_code == 403
+    assert client.get('/api/admin/profiles', headers={'X-Profile-Token': 'other'}).status_code == 403
+
+def test_profiled_request_is_listed_and_downloadable(make_app):
+    client = make_app('guarded', PROFILER_TOKEN='secret').test_client()
+    headers = {'X-Profile-Token': 'secret'}
+
+    response = client.get('/api/categories/flat', headers=headers)
+    assert response.status_code == 200
+    name = response.headers['X-Profile-ID']
+    assert name.endswith('.prof')
+
+    listed = client.get('/api/admin/profiles', headers=headers).get_json()['data']
+    assert [profile['name'] for profile in listed['profiles']] == [name]
+    assert listed['profiles'][0]['endpoint'] == 'categories.get_categories_flat'
+
+    download = client.get(f'/api/admin/profiles/{name}', headers=headers)
+    assert download.status_code == 200
+    assert download.data
+    assert client.get(f'/api/admin/profiles/{name}?format=text', headers=headers).status_code == 200
+
+def test_each_app_keeps_its_own_token(make_app):
+    guarded = make_app('guarded', PROFILER_TOKEN='secret').test_client()
+    make_app('plain')
+    make_app('other', PROFILER_TOKEN='other')
+
+    assert guarded.get('/api/admin/profiles', headers={'X-Profile-Token': 'secret'}).status_code == 200
+    assert guarded.get('/api/admin/profiles', headers={'X-Profile-Token': 'other'}).status_code == 403
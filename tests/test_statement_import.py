@@ -0,0 +1,42 @@
+import io
+from database import db
+from models import Transaction
+
+def upload(client, body, **form):
+    return client.post('/api/transactions/import', data=dict(form, file=(io.BytesIO(body), 'statement.csv')),
+                       content_type='multipart/form-data')
+
+def csv_rows(count):
+    return ''.join(f"2024-01-{i % 28 + 1:02d},-{i + 1}.50,Row {i}\n" for i in range(count)).encode()
+
+def test_invalid_utf8_reports_where_the_import_stopped(app, client):
+    app.config['STATEMENT_IMPORT_CHUNK_SIZE'] = 1000
+    body = b'date,amount,description\n' + csv_rows(3000) + b'2024-02-01,-1.00,Caf\xe9\n'
+
+    response = upload(client, body)
+
+    assert response.status_code == 400
+    assert response.is_json
+    report = response.get_json()['errors']
+    with app.app_context():
+        committed = db.session.query(Transaction).count()
+    assert report['imported'] == committed
+    assert report['last_committed_row'] == committed
+    assert report['stopped_at_row'] == committed + 1
+
+def test_csv_error_is_reported(app, client):
+    # csv rejects fields over its field_size_limit (128 KB)
+    body = b'date,amount,description\n2024-01-01,-1.00,ok\n2024-01-02,-2.00,' + b'x' * 200000 + b'\n'
+
+    response = upload(client, body)
+
+    assert response.status_code == 400
+    report = response.get_json()['errors']
+    assert report['stopped_at_row'] == 2
+    assert report['imported'] == 1
+    assert 'Invalid CSV' in report['errors'][-1]['error']
+
+def test_unknown_default_category_is_a_bad_request(client):
+    response = upload(client, b'date,amount,description\n2024-01-01,-1.00,ok\n', category_id='999')
+
+    assert response.status_code == 400
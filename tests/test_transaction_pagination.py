@@ -0,0 +1,41 @@
+from datetime import datetime
+from database import db
+from models import Transaction
+
+def add_transactions(app):
+    with app.app_context():
+        # Written by SQLAlchemy: microseconds
+        for second in range(3):
+            db.session.add(Transaction(user_id=1, amount=1, type='expense', date=datetime(2024, 5, 1).date(),
+                                       created_at=datetime(2024, 5, 1, 12, 0, second, 500000)))
+        db.session.commit()
+        # Written by SQL defaults / migrations: no fractional seconds, or no created_at at all
+        for created_at in ["'2024-05-01 12:00:01'", "'2024-05-01 12:00:01'", 'NULL', 'NULL']:
+            db.session.execute(db.text(
+                'INSERT INTO "transaction" (user_id, amount, type, date, created_at) '
+                f"SELECT 1, amount, type, '2024-05-01', {created_at} FROM \"transaction\" LIMIT 1"
+            ))
+        db.session.commit()
+        return {transaction_id for (transaction_id,) in db.session.query(Transaction.id)}
+
+def walk_pages(client, per_page):
+    seen = []
+    cursor = ''
+    # Bounded, so a cursor that repeats rows fails instead of looping forever
+    for _ in range(50):
+        response = client.get(f"/api/transactions/?cursor={cursor}&per_page={per_page}")
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        seen += [transaction['id'] for transaction in data['transactions']]
+        if not data['pagination']['has_next']:
+            return seen
+        cursor = data['pagination']['next_cursor']
+    raise AssertionError(f"pagination did not finish: {seen}")
+
+def test_cursor_pages_visit_every_row_once(app, client):
+    ids = add_transactions(app)
+
+    for per_page in (1, 2, 3):
+        seen = walk_pages(client, per_page)
+        assert len(seen) == len(set(seen))
+        assert set(seen) == ids